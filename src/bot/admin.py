@@ -0,0 +1,36 @@
+from django.contrib import admin
+
+from .models import BotCommand, BotShard
+
+
+@admin.register(BotCommand)
+class BotCommandAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'account',
+        'action',
+        'created',
+        'processed',
+    )
+
+    list_filter = (
+        'action',
+        'processed',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(BotShard)
+class BotShardAdmin(admin.ModelAdmin):
+    list_display = (
+        'number',
+        'pid',
+        'bots',
+        'loop_lag',
+        'updated',
+    )
+
+    def has_add_permission(self, request):
+        return False
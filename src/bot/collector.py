@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import logging
+from collections import defaultdict
+from typing import List, Dict, Callable, Awaitable, Set, NamedTuple
+
+from asgiref.sync import sync_to_async
+
+from common.cache import ITEM_HASH_NAMES_CACHE, MARKET_KEYS_CACHE, BOT_PREFERENCES_CACHE
+from common.utils import get_log_extra as extra, to_chunks
+from market.api import MarketApi
+from market.dispatcher import ChunkDispatcher, ChunkJob
+from market.domain.constants import GET_ITEMS_BY_HASH_NAME_LIMIT
+from market.models import Key
+from market.pool import KeyPool
+from market.storage import ListingStore
+from steam.models import Item
+
+logger = logging.getLogger(__name__)
+
+PricesCallback = Callable[[Set[str], Set[str]], Awaitable]
+
+
+class Subscriber(NamedTuple):
+    proxy: str
+    market_api: MarketApi
+    callback: PricesCallback
+
+
+class MarketPricesCollector:
+    def __init__(self):
+        self._listings = ListingStore()
+        self._key_pool = KeyPool()
+        self._dispatcher = ChunkDispatcher(self._key_pool)
+        self._subscribers: Dict[str, Subscriber] = {}
+
+    @property
+    def listings(self) -> ListingStore:
+        return self._listings
+
+    @property
+    def key_pool(self) -> KeyPool:
+        return self._key_pool
+
+    @property
+    def dispatcher(self) -> ChunkDispatcher:
+        return self._dispatcher
+
+    def subscribe(self, login: str, proxy: str, market_api: MarketApi, callback: PricesCallback):
+        self._subscribers[login] = Subscriber(proxy, market_api, callback)
+
+    def unsubscribe(self, login: str):
+        self._subscribers.pop(login, None)
+
+    async def collect_market_prices(self):
+        if not self._subscribers:
+            return
+
+        subscribers = dict(self._subscribers)
+        self._key_pool.update(await self._get_market_keys())
+        bots_hash_names = await self._get_bots_unique_item_hash_names(list(subscribers))
+        hash_names = set().union(*bots_hash_names.values())
+        hash_chunks = to_chunks(sorted(hash_names), GET_ITEMS_BY_HASH_NAME_LIMIT)
+        routes = itertools.cycle(subscribers.items())
+        jobs = [ChunkJob(login, sub.proxy, sub.market_api, chunk) for (login, sub), chunk in zip(routes, hash_chunks)]
+
+        logger.info(f'Start collecting prices for {len(hash_names)} items of {len(subscribers)} bots')
+        changed = set()
+        for response in await self._dispatcher.dispatch(jobs):
+            for hash_name, rows in response.listings().items():
+                if self._listings.put(hash_name, rows):
+                    changed.add(hash_name)
+        self._listings.evict(hash_names)
+
+        logger.info(f'Finish collecting prices for {len(self._listings)} items. Changed: {len(changed)}')
+        logger.debug(f'Dispatcher stats: {self._dispatcher.stats}')
+        logger.debug(f'Hash names cache: {ITEM_HASH_NAMES_CACHE.stats}. Keys cache: {MARKET_KEYS_CACHE.stats}. '
+                     f'Preferences cache: {BOT_PREFERENCES_CACHE.stats}')
+        await self._publish(subscribers, bots_hash_names, changed)
+
+    async def _publish(self, subscribers: Dict[str, Subscriber], bots_hash_names: Dict[str, Set[str]],
+                       changed: Set[str]):
+        logins = list(subscribers)
+        listed = self._listings.hash_names
+        callbacks = []
+        for login in logins:
+            hash_names = bots_hash_names.get(login, set())
+            callbacks.append(subscribers[login].callback(hash_names & listed, changed & hash_names))
+
+        results = await asyncio.gather(*callbacks, return_exceptions=True)
+        for login, result in zip(logins, results):
+            if isinstance(result, Exception):
+                logger.error(f'Failed to update market prices: {result!r}', extra=extra(login))
+
+    @sync_to_async
+    def _get_market_keys(self) -> List[str]:
+        return MARKET_KEYS_CACHE.get('active', self._load_market_keys)
+
+    @sync_to_async
+    def _get_bots_unique_item_hash_names(self, logins: List[str]) -> Dict[str, Set[str]]:
+        return ITEM_HASH_NAMES_CACHE.get_many(logins, self._load_bots_unique_item_hash_names, frozenset())
+
+    @staticmethod
+    def _load_market_keys() -> List[str]:
+        return list(Key.objects.filter(active=True).values_list('key', flat=True))
+
+    @staticmethod
+    def _load_bots_unique_item_hash_names(logins: List[str]) -> Dict[str, Set[str]]:
+        hash_names = defaultdict(set)
+        items = Item.objects.filter(account__login__in=logins).values_list('account__login', 'market_hash_name')
+        for login, hash_name in items.distinct():
+            hash_names[login].add(hash_name)
+        return hash_names
@@ -1,8 +1,20 @@
 from typing import Final
 
 MARKET_PING_INTERVAL: Final[float] = 170
+MARKET_PING_JITTER: Final[float] = 0.1
 MARKET_TEST_INTERVAL: Final[float] = 35
 MARKET_SET_STEAM_API_INTERVAL: Final[float] = 5
 MARKET_UPDATE_INVENTORY_INTERVAL: Final[float] = 60
 MARKET_GET_INVENTORY_INTERVAL: Final[float] = 5
 MARKET_COLLECTING_PRICES_INTERVAL: Final[float] = 3
+BOT_COMMANDS_POLLING_INTERVAL: Final[float] = 1
+BOT_SHARD_REPORT_INTERVAL: Final[float] = 10
+BOT_REBALANCE_INTERVAL: Final[float] = 30
+BOT_SHARD_REPLICAS: Final[int] = 100
+BOT_SHARD_LOAD_FACTOR: Final[float] = 1.25
+BOT_SHARD_RESTART_DELAY: Final[float] = 5
+MARKET_FULL_REFRESH_INTERVAL: Final[float] = 60
+BOT_DB_WRITE_INTERVAL: Final[float] = 1
+BOT_DB_WRITE_BATCH_SIZE: Final[int] = 100
+BOT_METRICS_HOST: Final[str] = '0.0.0.0'
+BOT_METRICS_PORT: Final[int] = 9100
@@ -0,0 +1,6 @@
+from common.utils import BaseEnum
+
+
+class CommandAction(BaseEnum):
+    Start = 1
+    Stop = 2
@@ -0,0 +1,122 @@
+import asyncio
+import random
+import time
+from datetime import timedelta
+from typing import List
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from bot.workflow import ITEM_MARKET_DATA_READ_FIELDS, ITEM_MARKET_DATA_WRITE_FIELDS
+from bot.writer import DbWriter
+from steam.domain.enums import Status
+from steam.models import Account, Item
+
+BENCHMARK_LOGIN_PREFIX = 'benchmark-'
+
+
+class Command(BaseCommand):
+    help = 'Measures DB time of one bot fleet cycle (prices update and items status update) on the configured database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bots', type=int, default=100)
+        parser.add_argument('--items', type=int, default=200, help='Items per bot')
+        parser.add_argument('--cycles', type=int, default=5)
+        parser.add_argument(
+            '--allow-write', action='store_true',
+            help='Confirm that synthetic accounts and items may be created and deleted in the configured database',
+        )
+
+    def handle(self, *args, bots: int, items: int, cycles: int, allow_write: bool, **options):
+        if not allow_write:
+            raise CommandError(
+                f'benchmark_db writes synthetic data to the {connection.settings_dict["NAME"]} database. '
+                f'Run it against a throwaway database with --allow-write'
+            )
+
+        self._cleanup()
+        accounts = self._make_accounts(bots, items)
+        try:
+            timings = asyncio.run(self._run(accounts, cycles))
+        finally:
+            self._cleanup()
+
+        self.stdout.write(f'Database: {connection.vendor}, bots: {bots}, items per bot: {items}')
+        self.stdout.write(f'Cycle: min {min(timings) * 1000:.1f} ms, avg {sum(timings) / len(timings) * 1000:.1f} ms')
+
+    async def _run(self, accounts: List[Account], cycles: int) -> List[float]:
+        writer = DbWriter()
+        timings = []
+        for _ in range(cycles):
+            then = time.perf_counter()
+            bots = asyncio.gather(*(self._run_bot(writer, account) for account in accounts))
+            while not bots.done():
+                await asyncio.sleep(0)
+                await writer.flush()
+            await bots
+            timings.append(time.perf_counter() - then)
+
+        return timings
+
+    async def _run_bot(self, writer: DbWriter, account: Account):
+        items = await self._get_items(account)
+        now = timezone.now()
+        for item in items:
+            item.market_time = now
+            item.market_min_price = random.randint(1, 1000)
+            item.calculate_expected_prices(60)
+        await writer.bulk_update(Item, items, ITEM_MARKET_DATA_WRITE_FIELDS)
+
+        items_ids = [item.asset_id for item in items[:10]]
+        await writer.execute(
+            lambda: Item.objects.filter(account=account, status=Status.New.value, asset_id__in=items_ids).count()
+        )
+
+    @sync_to_async
+    def _get_items(self, account: Account) -> List[Item]:
+        hash_names = set(Item.objects.filter(account=account).values_list('market_hash_name', flat=True).distinct())
+        return list(Item.objects.filter(
+            account=account,
+            market_hash_name__in=hash_names,
+            status__in=Status.get_market_statuses(),
+        ).only(*ITEM_MARKET_DATA_READ_FIELDS))
+
+    @staticmethod
+    def _make_accounts(bots: int, items: int) -> List[Account]:
+        Account.objects.bulk_create(
+            Account(
+                login=f'{BENCHMARK_LOGIN_PREFIX}{number}',
+                steam_id=10 ** 12 + number,
+                steam_api=f'{BENCHMARK_LOGIN_PREFIX}{number}',
+                market_api_key=f'{BENCHMARK_LOGIN_PREFIX}{number}',
+                google_drive_id=f'{BENCHMARK_LOGIN_PREFIX}{number}',
+            )
+            for number in range(bots)
+        )
+        accounts = list(Account.objects.filter(login__startswith=BENCHMARK_LOGIN_PREFIX))
+        now = timezone.now()
+        Item.objects.bulk_create(
+            (
+                Item(
+                    asset_id=f'{BENCHMARK_LOGIN_PREFIX}{account.id}-{number}',
+                    account=account,
+                    market_hash_name=f'Item | Skin {number % 50}',
+                    market_ru_name=f'Item | Skin {number % 50}',
+                    google_price_usd=random.random() * 100,
+                    google_drive_time=now,
+                    steam_price_usd=1,
+                    steam_time=now,
+                    hold=now + timedelta(days=7),
+                    status=random.choice(Status.get_market_statuses()),
+                )
+                for account in accounts for number in range(items)
+            ),
+            batch_size=1000,
+        )
+        return accounts
+
+    @staticmethod
+    def _cleanup():
+        Account.objects.filter(login__startswith=BENCHMARK_LOGIN_PREFIX).delete()
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import time
+from multiprocessing import Process
+from multiprocessing.connection import wait
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from bot.constants import BOT_SHARD_RESTART_DELAY
+from bot.manager import BotManager
+from bot.models import BotShard
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Runs all enabled bots and listens for start/stop commands from the admin'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--shards', type=int, default=1,
+            help='Number of bot processes to spread accounts across. Market prices are deduplicated per process, '
+                 'so hash names shared by bots of different shards are fetched once by every such shard',
+        )
+
+    def handle(self, *args, shards: int, **options):
+        BotShard.objects.filter(number__gte=shards).delete()
+        if shards == 1:
+            return self._run_shard(0, shards)
+
+        processes = {shard: self._start_shard(shard, shards) for shard in range(shards)}
+        try:
+            while True:
+                wait([process.sentinel for process in processes.values()])
+                dead = [shard for shard, process in processes.items() if not process.is_alive()]
+                [
+                    logger.error(f'Bot shard {shard + 1}/{shards} exited with code {processes[shard].exitcode}')
+                    for shard in dead
+                ]
+                time.sleep(BOT_SHARD_RESTART_DELAY)
+                processes.update({shard: self._start_shard(shard, shards) for shard in dead})
+        except KeyboardInterrupt:
+            [process.terminate() for process in processes.values()]
+            [process.join() for process in processes.values()]
+
+    def _start_shard(self, shard: int, shards: int) -> Process:
+        connections.close_all()
+        process = Process(target=self._run_shard, args=(shard, shards), name=f'bot-shard-{shard}')
+        process.start()
+        logger.info(f'Bot shard {shard + 1}/{shards} started with pid {process.pid}')
+        return process
+
+    @staticmethod
+    def _run_shard(shard: int, shards: int):
+        try:
+            asyncio.run(BotManager(shard, shards).run())
+        except KeyboardInterrupt:
+            pass
@@ -1,41 +1,195 @@
 import asyncio
 import logging
+import os
 from asyncio import Task, CancelledError
-from typing import List, Dict
+from dataclasses import asdict
+from typing import List, Dict, Set, Optional
 
+from aiohttp import web
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from yarl import URL
+
+from common.http.metrics import HTTP_METRICS, render_gauges
+from common.http.pool import HttpPool
+from common.scheduler import Scheduler, ScheduleMode
 from common.utils import get_log_extra as extra
+from settings.logging.handlers import BatchingLogstashHandler
 from steam.models import Account
+from .collector import MarketPricesCollector
+from .constants import *
+from .domain.enums import CommandAction
+from .models import BotCommand, BotShard
+from .sharding import HashRing
 from .workflow import BotWorkflow
+from .writer import DbWriter
 
 logger = logging.getLogger(__name__)
 
 
 class BotManager:
-    def __init__(self):
+    def __init__(self, shard: int = 0, shards: int = 1):
+        self._shard = shard
+        self._ring = HashRing(shards)
         self._tasks: Dict[str, Task] = {}
+        self._workflows: Dict[str, BotWorkflow] = {}
+        self._failed: Set[str] = set()
+        self._last_command_id = 0
+        self._assignment: Dict[str, int] = {}
+        self._prices_collector = MarketPricesCollector()
+        self._db_writer = DbWriter()
+        self._http_pool = HttpPool(metrics_key_hosts={URL(settings.MARKET_SETTINGS.host).host})
+        self._scheduler = Scheduler()
 
-    async def run_bots(self, bots: List[Account]):
+    async def run(self):
+        logger.info(f'Bot runner started. Shard {self._shard + 1}/{self._ring.shards}')
+        self._last_command_id = await self._get_last_command_id()
+        await self.rebalance()
+        metrics_server = await self._start_metrics_server()
+        self._scheduler.add(
+            'process_commands', self.process_commands, BOT_COMMANDS_POLLING_INTERVAL, mode=ScheduleMode.FixedDelay
+        )
+        self._scheduler.add('rebalance', self.rebalance, BOT_REBALANCE_INTERVAL, mode=ScheduleMode.FixedDelay)
+        self._scheduler.add('report_load', self.report_load, BOT_SHARD_REPORT_INTERVAL)
+        self._scheduler.add(
+            'collect_market_prices', self._prices_collector.collect_market_prices, MARKET_COLLECTING_PRICES_INTERVAL
+        )
         try:
-            [await task for task in [self._create_task(bot) for bot in bots if bot.login not in self._tasks]]
+            await asyncio.gather(self._scheduler.run(), self._db_writer.run())
         except CancelledError:
             pass
+        finally:
+            tasks = list(self._tasks.values())
+            [self._cancel_task(login) for login in list(self._tasks)]
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._http_pool.close()
+            if metrics_server:
+                await metrics_server.cleanup()
+            logger.info(f'Bot runner stopped. Shard {self._shard + 1}/{self._ring.shards}')
+
+    async def process_commands(self):
+        commands = await self._get_new_commands()
+        if not commands:
+            return
+
+        self._last_command_id = commands[-1].id
+        self._failed.difference_update(
+            command.account.login for command in commands if command.action == CommandAction.Start.value
+        )
+        await self.rebalance()
+        await self._mark_processed(
+            [command.id for command in commands if self._get_owner(command.account.login) == self._shard]
+        )
+
+    async def rebalance(self):
+        bots = await self._get_enabled_bots()
+        self._assignment = self._ring.assign(bot.login for bot in bots)
+        owned = {login for login, shard in self._assignment.items() if shard == self._shard}
+
+        [self._cancel_task(login) for login in list(self._tasks) if login not in owned]
+        self.run_bots([bot for bot in bots if bot.login in owned and bot.login not in self._failed])
+
+    async def report_load(self):
+        loop = asyncio.get_running_loop()
+        then = loop.time()
+        await asyncio.sleep(0)
+        await self._save_load(len(self._tasks), loop.time() - then)
+        logger.debug(f'Http pool stats: {self._http_pool.stats}')
+
+    async def get_metrics(self, request: web.Request) -> web.Response:
+        metrics = [
+            HTTP_METRICS.render(),
+            render_gauges('http_pool', asdict(self._http_pool.stats)),
+            render_gauges('dispatcher', self._prices_collector.dispatcher.stats),
+            render_gauges('shard', {'bots': len(self._tasks)}),
+            *(
+                render_gauges('scheduler', asdict(stats), {'task': name})
+                for name, stats in self._scheduler.stats.items()
+            ),
+            *(
+                render_gauges('bot_scheduler', asdict(stats), {'login': login, 'task': name})
+                for login, workflow in self._workflows.items() for name, stats in workflow.scheduler.stats.items()
+            ),
+            *(render_gauges('logstash', asdict(handler.stats)) for handler in self._get_logstash_handlers()),
+        ]
+        return web.Response(text=''.join(metrics))
+
+    def run_bots(self, bots: List[Account]):
+        [self._create_task(bot) for bot in bots if bot.login not in self._tasks]
 
     def stop_bots(self, bots: List[Account]):
-        for bot in bots:
-            if bot.login in self._tasks:
-                task = self._tasks[bot.login]
-                if not task.done():
-                    logger.info('Stopping bot', extra=extra(bot.login))
-                    task.cancel()
-                self._tasks.pop(bot.login)
+        [self._cancel_task(bot.login) for bot in bots if bot.login in self._tasks]
+
+    async def _start_metrics_server(self) -> Optional[web.AppRunner]:
+        app = web.Application()
+        app.router.add_get('/metrics', self.get_metrics)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, BOT_METRICS_HOST, BOT_METRICS_PORT + self._shard).start()
+        except OSError as ex:
+            logger.warning(f'Failed to start metrics server: {ex!r}')
+            await runner.cleanup()
+            return None
+
+        logger.info(f'Metrics are served on {BOT_METRICS_HOST}:{BOT_METRICS_PORT + self._shard}/metrics')
+        return runner
+
+    @staticmethod
+    def _get_logstash_handlers() -> Set[BatchingLogstashHandler]:
+        handlers = logging.getLogger(__name__.split('.')[0]).handlers
+        return {handler for handler in handlers if isinstance(handler, BatchingLogstashHandler)}
+
+    def _get_owner(self, login: str) -> int:
+        return self._assignment[login] if login in self._assignment else self._ring.get_shard(login)
 
     def _create_task(self, bot: Account) -> Task:
-        bot_workflow = BotWorkflow(bot)
+        bot_workflow = BotWorkflow(bot, self._prices_collector, self._db_writer, self._http_pool)
 
         task = asyncio.create_task(bot_workflow.run())
         task.set_name(bot.login)
+        task.add_done_callback(self._on_task_done)
         self._tasks[bot.login] = task
+        self._workflows[bot.login] = bot_workflow
 
         logger.info('Running bot', extra=extra(bot.login))
 
         return task
+
+    def _cancel_task(self, login: str):
+        task = self._tasks.pop(login)
+        self._workflows.pop(login, None)
+        if not task.done():
+            logger.info('Stopping bot', extra=extra(login))
+            task.cancel()
+
+    def _on_task_done(self, task: Task):
+        if self._tasks.get(task.get_name()) is task:
+            self._tasks.pop(task.get_name())
+            self._workflows.pop(task.get_name(), None)
+        if not task.cancelled() and task.exception():
+            self._failed.add(task.get_name())
+            logger.error(f'Bot stopped with error: {task.exception()!r}', extra=extra(task.get_name()))
+
+    @sync_to_async
+    def _get_enabled_bots(self) -> List[Account]:
+        return list(Account.objects.filter(is_on=True))
+
+    @sync_to_async
+    def _get_last_command_id(self) -> int:
+        return BotCommand.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    @sync_to_async
+    def _get_new_commands(self) -> List[BotCommand]:
+        return list(BotCommand.objects.filter(id__gt=self._last_command_id).select_related('account').order_by('id'))
+
+    @sync_to_async
+    def _mark_processed(self, commands_ids: List[int]):
+        BotCommand.objects.filter(id__in=commands_ids).update(processed=True)
+
+    @sync_to_async
+    def _save_load(self, bots: int, loop_lag: float):
+        BotShard.objects.update_or_create(
+            number=self._shard,
+            defaults={'pid': os.getpid(), 'bots': bots, 'loop_lag': loop_lag},
+        )
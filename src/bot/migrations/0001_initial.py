@@ -0,0 +1,26 @@
+# Generated by Django 4.1 on 2026-10-18 10:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('steam', '0005_item_expected_max_price_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BotCommand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.IntegerField(choices=[(1, 'Start'), (2, 'Stop')])),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('processed', models.BooleanField(default=False)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='steam.account')),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+from typing import Iterable
+
+from django.db import models
+
+from steam.models import Account
+from .domain.enums import CommandAction
+
+
+class BotCommand(models.Model):
+    account = models.ForeignKey(Account, on_delete=models.CASCADE)
+    action = models.IntegerField(choices=CommandAction.to_list())
+    created = models.DateTimeField(auto_now_add=True)
+    processed = models.BooleanField(default=False)
+
+    def __str__(self):
+        return f'{CommandAction(self.action).name} {self.account}'
+
+    @staticmethod
+    def send(accounts: Iterable[Account], action: CommandAction):
+        BotCommand.objects.bulk_create(BotCommand(account=account, action=action.value) for account in accounts)
+
+
+class BotShard(models.Model):
+    number = models.PositiveIntegerField(unique=True)
+    pid = models.PositiveIntegerField()
+    bots = models.PositiveIntegerField(default=0)
+    loop_lag = models.FloatField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Shard {self.number}'
@@ -0,0 +1,43 @@
+import hashlib
+from bisect import bisect
+from math import ceil
+from typing import Dict, Iterable
+
+from .constants import BOT_SHARD_REPLICAS, BOT_SHARD_LOAD_FACTOR
+
+
+class HashRing:
+    def __init__(self, shards: int, replicas: int = BOT_SHARD_REPLICAS):
+        self._shards = shards
+        self._ring = sorted((self._hash(f'{shard}:{replica}'), shard)
+                            for shard in range(shards) for replica in range(replicas))
+        self._hashes = [hash_ for hash_, _ in self._ring]
+
+    @property
+    def shards(self) -> int:
+        return self._shards
+
+    def get_shard(self, key: str) -> int:
+        return self._ring[self._get_position(key)][1]
+
+    def assign(self, keys: Iterable[str], load_factor: float = BOT_SHARD_LOAD_FACTOR) -> Dict[str, int]:
+        keys = sorted(set(keys), key=self._hash)
+        capacity = ceil(len(keys) / self._shards * load_factor)
+        loads = [0] * self._shards
+        assignment = {}
+        for key in keys:
+            position = self._get_position(key)
+            while loads[self._ring[position][1]] >= capacity:
+                position = (position + 1) % len(self._ring)
+            shard = self._ring[position][1]
+            loads[shard] += 1
+            assignment[key] = shard
+
+        return assignment
+
+    def _get_position(self, key: str) -> int:
+        return bisect(self._hashes, self._hash(key)) % len(self._ring)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
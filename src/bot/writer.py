@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from asyncio import Future
+from collections import defaultdict
+from traceback import format_exc as traceback
+from typing import List, Tuple, Callable, Any, NamedTuple, Type, Union, Dict, Iterable
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Model
+
+from common.utils import get_log_extra as extra
+from .constants import BOT_DB_WRITE_INTERVAL, BOT_DB_WRITE_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class BulkUpdate(NamedTuple):
+    model: Type[Model]
+    objs: List[Model]
+    fields: Tuple[str, ...]
+
+
+Write = Union[BulkUpdate, Callable[[], Any]]
+
+
+class DbWriter:
+    def __init__(self, interval: float = BOT_DB_WRITE_INTERVAL):
+        self._interval = interval
+        self._writes: List[Tuple[Write, Future]] = []
+        self.ticks = 0
+        self.writes = 0
+        self.transactions = 0
+
+    async def bulk_update(self, model: Type[Model], objs: Iterable[Model], fields: Iterable[str]):
+        objs = list(objs)
+        if objs:
+            await self.execute(BulkUpdate(model, objs, tuple(fields)))
+
+    async def execute(self, write: Write) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._writes.append((write, future))
+        return await future
+
+    async def run(self):
+        try:
+            while True:
+                await asyncio.sleep(self._interval)
+                await self.flush()
+        finally:
+            [future.cancel() for _, future in self._writes]
+            self._writes.clear()
+
+    async def flush(self):
+        if not self._writes:
+            return
+
+        writes, self._writes = self._writes, []
+        results = await self._apply_all([write for write, _ in writes])
+        for (_, future), result in zip(writes, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        self.ticks += 1
+        self.writes += len(writes)
+
+    @sync_to_async
+    def _apply_all(self, writes: List[Write]) -> List[Any]:
+        try:
+            with transaction.atomic():
+                results = self._apply(writes)
+            self.transactions += 1
+            return results
+        except Exception as ex:
+            logger.warning(f'Coalesced write of {len(writes)} updates failed: {ex!r}. Retrying one by one')
+
+        return [self._apply_isolated(write) for write in writes]
+
+    def _apply_isolated(self, write: Write) -> Any:
+        try:
+            with transaction.atomic():
+                result = self._apply([write])[0]
+            self.transactions += 1
+            return result
+        except Exception as ex:
+            logger.error(f'Db write failed: {ex!r}', extra=extra(traceback=traceback()))
+            return ex
+
+    @staticmethod
+    def _apply(writes: List[Write]) -> List[Any]:
+        results = []
+        bulk_updates: Dict[Tuple[Type[Model], Tuple[str, ...]], List[Model]] = defaultdict(list)
+        for write in writes:
+            if isinstance(write, BulkUpdate):
+                bulk_updates[(write.model, write.fields)].extend(write.objs)
+                results.append(None)
+            else:
+                results.append(write())
+
+        [
+            model.objects.bulk_update(objs, fields=fields, batch_size=BOT_DB_WRITE_BATCH_SIZE)
+            for (model, fields), objs in bulk_updates.items()
+        ]
+        return results
@@ -0,0 +1,62 @@
+import time
+import uuid
+from typing import Dict, Hashable, Any, Callable, Iterable, List, Final
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_CHECK_INTERVAL: Final[float] = 1
+
+
+class VersionedCache:
+    def __init__(self, name: str, check_interval: float = VERSION_CHECK_INTERVAL):
+        self._version_key = f'{name}:version'
+        self._check_interval = check_interval
+        self._next_check = 0
+        self._version = None
+        self._values: Dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        return self.get_many([key], lambda keys: {key: loader()})[key]
+
+    def get_many(self, keys: Iterable[Hashable], loader: Callable[[List[Hashable]], Dict[Hashable, Any]],
+                 default: Any = None) -> Dict[Hashable, Any]:
+        self._sync()
+        keys = list(keys)
+        missing = [key for key in keys if key not in self._values]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            values = loader(missing)
+            self._values.update((key, values.get(key, default)) for key in missing)
+
+        return {key: self._values[key] for key in keys}
+
+    def invalidate(self):
+        cache.set(self._version_key, uuid.uuid4().hex, timeout=None)
+        self._values.clear()
+        self._next_check = 0
+
+    def invalidate_on_commit(self):
+        transaction.on_commit(self.invalidate)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._values)}
+
+    def _sync(self):
+        if time.monotonic() < self._next_check:
+            return
+
+        self._next_check = time.monotonic() + self._check_interval
+        version = cache.get(self._version_key, 0)
+        if version != self._version:
+            self._values.clear()
+            self._version = version
+
+
+ITEM_HASH_NAMES_CACHE: Final[VersionedCache] = VersionedCache('item_hash_names')
+MARKET_KEYS_CACHE: Final[VersionedCache] = VersionedCache('market_keys')
+BOT_PREFERENCES_CACHE: Final[VersionedCache] = VersionedCache('bot_preferences')
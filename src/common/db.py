@@ -0,0 +1,39 @@
+from typing import Type, Optional
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Model
+
+
+def set_sqlite_pragmas(sender, connection: BaseDatabaseWrapper, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+
+    with connection.cursor() as cursor:
+        [cursor.execute(f'PRAGMA {name} = {value}') for name, value in settings.SQLITE_PRAGMAS.items()]
+
+
+def estimate_count(model: Type[Model]) -> Optional[int]:
+    table = model._meta.db_table
+    connection = connections[router.db_for_read(model)]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if not cursor.fetchone():
+                return None
+            cursor.execute('SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl = %s', [table])
+        else:
+            return None
+        row = cursor.fetchone()
+
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+def analyze(model: Type[Model]):
+    connection = connections[router.db_for_write(model)]
+    if connection.vendor in ('postgresql', 'sqlite'):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
@@ -1,11 +1,17 @@
+import time
 from abc import ABC
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, Tuple, AbstractSet
 
-from aiohttp import ClientSession, ClientResponse
+from aiohttp import ClientSession, ClientResponse, TraceConfig, TraceRequestStartParams, TraceRequestEndParams, \
+    TraceRequestExceptionParams, TraceResponseChunkReceivedParams
 from aiohttp_socks import ProxyConnector
 
+from common.http.metrics import HttpMetrics
 from common.models import ProxyCredentials
 
+DIRECT_PROXY_LABEL = 'direct'
+
 
 class BaseHttpClient(ABC):
     def get(self, uri: str):
@@ -15,10 +21,42 @@ class BaseHttpClient(ABC):
         raise NotImplementedError()
 
 
+def create_metrics_trace_config(
+        metrics: HttpMetrics,
+        proxy: ProxyCredentials = None,
+        key_hosts: AbstractSet[str] = frozenset(),
+) -> TraceConfig:
+    proxy_label = proxy.label if proxy else DIRECT_PROXY_LABEL
+
+    async def on_request_start(session: ClientSession, context: SimpleNamespace, params: TraceRequestStartParams):
+        context.started = time.perf_counter()
+
+    async def on_request_end(session: ClientSession, context: SimpleNamespace, params: TraceRequestEndParams):
+        elapsed = time.perf_counter() - context.started
+        key = params.url.query.get('key') if params.url.host in key_hosts else None
+        metrics.observe(params.method, params.url.path, params.response.status, elapsed, proxy_label, key)
+
+    async def on_request_exception(session: ClientSession, context: SimpleNamespace,
+                                   params: TraceRequestExceptionParams):
+        metrics.record_error(params.method, params.url.path, params.exception, proxy_label)
+
+    async def on_response_chunk_received(session: ClientSession, context: SimpleNamespace,
+                                         params: TraceResponseChunkReceivedParams):
+        metrics.record_bytes(params.url.path, len(params.chunk))
+
+    trace_config = TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    trace_config.on_response_chunk_received.append(on_response_chunk_received)
+    return trace_config
+
+
 class AsyncHttpClient(BaseHttpClient):
-    def __init__(self, proxy: ProxyCredentials = None):
-        self._proxy_connector = None if not proxy else ProxyConnector(**proxy.dict())
-        self._session = ClientSession(connector=self._proxy_connector)
+    def __init__(self, proxy: ProxyCredentials = None, session: ClientSession = None):
+        if session is None:
+            session = ClientSession(connector=None if not proxy else ProxyConnector(**proxy.dict()))
+        self._session = session
 
     @property
     def session(self) -> ClientSession:
@@ -28,8 +66,10 @@ class AsyncHttpClient(BaseHttpClient):
     def session(self, session: ClientSession):
         self._session = session
 
-    async def get(self, uri, params: dict = None) -> ClientResponse:
-        return await self._session.get(uri, params=params)
+    async def get(self, uri, params: dict = None) -> Tuple[ClientResponse, bytes]:
+        async with self._session.get(uri, params=params) as response:
+            return response, await response.read()
 
-    async def post(self, uri, data) -> ClientResponse:
-        return await self._session.post(uri, data=data)
+    async def post(self, uri, data) -> Tuple[ClientResponse, bytes]:
+        async with self._session.post(uri, data=data) as response:
+            return response, await response.read()
@@ -0,0 +1,120 @@
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Tuple, Final, List, Optional
+
+LATENCY_BUCKETS: Final[Tuple[float, ...]] = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+METRICS_PREFIX: Final[str] = 'tm'
+ID_PATTERN: Final[re.Pattern] = re.compile(r'\d{3,}')
+
+
+class Histogram:
+    __slots__ = ('_buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self._buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self._buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip((*self._buckets, '+Inf'), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class HttpMetrics:
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._responses: Counter = Counter()
+        self._errors: Counter = Counter()
+        self._bytes: Counter = Counter()
+        self._keys: Dict[str, Histogram] = {}
+        self._proxies: Dict[str, Histogram] = {}
+        self._retries: Counter = Counter()
+
+    def observe(self, method: str, path: str, status: int, elapsed: float, proxy: str, key: Optional[str]):
+        endpoint = self.get_endpoint(path)
+        self._get_histogram(self._latency, (method, endpoint)).observe(elapsed)
+        self._responses[(endpoint, status)] += 1
+        self._get_histogram(self._proxies, proxy).observe(elapsed)
+        if key:
+            self._get_histogram(self._keys, self.get_key_label(key)).observe(elapsed)
+
+    def record_error(self, method: str, path: str, error: BaseException, proxy: str):
+        self._errors[(self.get_endpoint(path), type(error).__name__, proxy)] += 1
+
+    def record_bytes(self, path: str, size: int):
+        self._bytes[self.get_endpoint(path)] += size
+
+    def record_retry(self, path: str, key: Optional[str], proxy: str):
+        self._retries[(self.get_endpoint(path), self.get_key_label(key) if key else '', proxy)] += 1
+
+    def render(self) -> str:
+        prefix = METRICS_PREFIX
+        lines = [f'# TYPE {prefix}_http_request_duration_seconds histogram']
+        for (method, endpoint), histogram in self._latency.items():
+            lines += histogram.render(f'{prefix}_http_request_duration_seconds',
+                                      f'method="{method}",endpoint="{endpoint}"')
+        lines.append(f'# TYPE {prefix}_http_key_duration_seconds histogram')
+        for key, histogram in self._keys.items():
+            lines += histogram.render(f'{prefix}_http_key_duration_seconds', f'key="{key}"')
+        lines.append(f'# TYPE {prefix}_http_proxy_duration_seconds histogram')
+        for proxy, histogram in self._proxies.items():
+            lines += histogram.render(f'{prefix}_http_proxy_duration_seconds', f'proxy="{proxy}"')
+        lines.append(f'# TYPE {prefix}_http_responses_total counter')
+        lines += [
+            f'{prefix}_http_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}'
+            for (endpoint, status), count in self._responses.items()
+        ]
+        lines.append(f'# TYPE {prefix}_http_errors_total counter')
+        lines += [
+            f'{prefix}_http_errors_total{{endpoint="{endpoint}",error="{error}",proxy="{proxy}"}} {count}'
+            for (endpoint, error, proxy), count in self._errors.items()
+        ]
+        lines.append(f'# TYPE {prefix}_http_received_bytes_total counter')
+        lines += [
+            f'{prefix}_http_received_bytes_total{{endpoint="{endpoint}"}} {size}'
+            for endpoint, size in self._bytes.items()
+        ]
+        lines.append(f'# TYPE {prefix}_http_retries_total counter')
+        lines += [
+            f'{prefix}_http_retries_total{{endpoint="{endpoint}",key="{key}",proxy="{proxy}"}} {count}'
+            for (endpoint, key, proxy), count in self._retries.items()
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def _get_histogram(self, histograms: Dict, label) -> Histogram:
+        if label not in histograms:
+            histograms[label] = Histogram(self._buckets)
+        return histograms[label]
+
+    @staticmethod
+    def get_endpoint(path: str) -> str:
+        return ID_PATTERN.sub(':id', path)
+
+    @staticmethod
+    def get_key_label(key: str) -> str:
+        return f'{key[:6]}...'
+
+
+def render_gauges(name: str, values: Dict[str, float], labels: Dict[str, str] = None) -> str:
+    labels = '{' + ','.join(f'{label}="{value}"' for label, value in labels.items()) + '}' if labels else ''
+    return ''.join(
+        f'{METRICS_PREFIX}_{name}_{field}{labels} {value}\n'
+        for field, value in values.items() if isinstance(value, (int, float))
+    )
+
+
+HTTP_METRICS: Final[HttpMetrics] = HttpMetrics()
@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Final, AbstractSet
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, TraceConfig, DummyCookieJar
+from aiohttp_socks import ProxyConnector
+
+from common.http.client import create_metrics_trace_config
+from common.http.metrics import HttpMetrics, HTTP_METRICS
+from common.models import ProxyCredentials
+
+HTTP_POOL_LIMIT: Final[int] = 100
+HTTP_POOL_LIMIT_PER_HOST: Final[int] = 20
+HTTP_KEEPALIVE_TIMEOUT: Final[float] = 60
+HTTP_DNS_CACHE_TTL: Final[int] = 300
+HTTP_TOTAL_TIMEOUT: Final[float] = 30
+HTTP_CONNECT_TIMEOUT: Final[float] = 10
+
+ProxyKey = Optional[Tuple]
+
+
+@dataclass
+class HttpPoolStats:
+    connectors: int = 0
+    sessions: int = 0
+    dedicated_sessions: int = 0
+    requests: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+
+class HttpPool:
+    def __init__(
+            self,
+            limit: int = HTTP_POOL_LIMIT,
+            limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout: float = HTTP_KEEPALIVE_TIMEOUT,
+            dns_cache_ttl: int = HTTP_DNS_CACHE_TTL,
+            timeout: ClientTimeout = ClientTimeout(total=HTTP_TOTAL_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            metrics: HttpMetrics = HTTP_METRICS,
+            metrics_key_hosts: AbstractSet[str] = frozenset(),
+    ):
+        self._connector_options = dict(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=keepalive_timeout,
+            ttl_dns_cache=dns_cache_ttl,
+        )
+        self._timeout = timeout
+        self._metrics = metrics
+        self._metrics_key_hosts = metrics_key_hosts
+        self._connectors: Dict[ProxyKey, TCPConnector] = {}
+        self._sessions: Dict[ProxyKey, ClientSession] = {}
+        self._metrics_trace_configs: Dict[ProxyKey, TraceConfig] = {}
+        self._stats = HttpPoolStats()
+        self._trace_config = self._create_trace_config()
+
+    @property
+    def stats(self) -> HttpPoolStats:
+        self._stats.connectors = len(self._connectors)
+        self._stats.sessions = len(self._sessions)
+        return self._stats
+
+    def get_session(self, proxy: ProxyCredentials = None) -> ClientSession:
+        key = self._get_key(proxy)
+        if key not in self._sessions or self._sessions[key].closed:
+            self._sessions[key] = self._create_session(proxy, DummyCookieJar())
+        return self._sessions[key]
+
+    def create_session(self, proxy: ProxyCredentials = None) -> ClientSession:
+        self._stats.dedicated_sessions += 1
+        return self._create_session(proxy)
+
+    async def close(self):
+        [await session.close() for session in self._sessions.values()]
+        [await connector.close() for connector in self._connectors.values()]
+        self._sessions.clear()
+        self._connectors.clear()
+
+    def _create_session(self, proxy: Optional[ProxyCredentials], cookie_jar=None) -> ClientSession:
+        return ClientSession(
+            connector=self._get_connector(proxy),
+            connector_owner=False,
+            cookie_jar=cookie_jar,
+            timeout=self._timeout,
+            trace_configs=[self._trace_config, self._get_metrics_trace_config(proxy)],
+        )
+
+    def _get_metrics_trace_config(self, proxy: Optional[ProxyCredentials]) -> TraceConfig:
+        key = self._get_key(proxy)
+        if key not in self._metrics_trace_configs:
+            self._metrics_trace_configs[key] = create_metrics_trace_config(self._metrics, proxy, self._metrics_key_hosts)
+        return self._metrics_trace_configs[key]
+
+    def _get_connector(self, proxy: Optional[ProxyCredentials]) -> TCPConnector:
+        key = self._get_key(proxy)
+        if key not in self._connectors or self._connectors[key].closed:
+            if proxy:
+                self._connectors[key] = ProxyConnector(**proxy.dict(), **self._connector_options)
+            else:
+                self._connectors[key] = TCPConnector(**self._connector_options)
+        return self._connectors[key]
+
+    def _create_trace_config(self) -> TraceConfig:
+        trace_config = TraceConfig()
+        counters = [
+            (trace_config.on_request_start, 'requests'),
+            (trace_config.on_connection_create_end, 'connections_created'),
+            (trace_config.on_connection_reuseconn, 'connections_reused'),
+            (trace_config.on_dns_cache_hit, 'dns_cache_hits'),
+            (trace_config.on_dns_cache_miss, 'dns_cache_misses'),
+        ]
+        [signal.append(self._create_counter(counter)) for signal, counter in counters]
+        return trace_config
+
+    def _create_counter(self, counter: str):
+        async def increment(*args):
+            setattr(self._stats, counter, getattr(self._stats, counter) + 1)
+
+        return increment
+
+    @staticmethod
+    def _get_key(proxy: Optional[ProxyCredentials]) -> ProxyKey:
+        return tuple(proxy.dict().values()) if proxy else None
@@ -9,6 +9,10 @@ class ProxyCredentials(BaseModel):
     username: str
     password: str
 
+    @property
+    def label(self) -> str:
+        return f'{self.host}:{self.port}'
+
     @staticmethod
     def parse_str(raw_str: str, proxy_type: ProxyType = ProxyType.SOCKS5):
         host, port, username, password = raw_str.split(':')
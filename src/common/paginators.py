@@ -0,0 +1,30 @@
+from typing import Final
+
+from django.core.paginator import Paginator, Page, EmptyPage
+from django.utils.functional import cached_property
+
+from common.db import estimate_count
+
+EXACT_COUNT_LIMIT: Final[int] = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    estimated = False
+
+    @cached_property
+    def count(self) -> int:
+        if self.object_list.query.where:
+            return super().count
+
+        estimate = estimate_count(self.object_list.model)
+        if estimate is None or estimate <= EXACT_COUNT_LIMIT:
+            return super().count
+
+        self.estimated = True
+        return estimate
+
+    def page(self, number) -> Page:
+        page = super().page(number)
+        if self.estimated and page.number > 1 and not page.object_list:
+            raise EmptyPage('That page contains no results')
+        return page
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import random
+import zlib
+from dataclasses import dataclass
+from traceback import format_exc as traceback
+from typing import Callable, Awaitable, Dict, List, Optional, Final
+
+from common.utils import BaseEnum, get_log_extra as extra
+
+logger = logging.getLogger(__name__)
+
+PHASE_RESOLUTION: Final[int] = 2 ** 32
+
+
+class ScheduleMode(BaseEnum):
+    FixedRate = 1
+    FixedDelay = 2
+
+
+class OverrunPolicy(BaseEnum):
+    Skip = 1
+    RunNow = 2
+
+
+@dataclass
+class TaskStats:
+    runs: int = 0
+    failures: int = 0
+    overruns: int = 0
+    skipped: int = 0
+    last_duration: float = 0
+    max_duration: float = 0
+    total_duration: float = 0
+    last_lag: float = 0
+    max_lag: float = 0
+
+    @property
+    def mean_duration(self) -> float:
+        return self.total_duration / self.runs if self.runs else 0
+
+
+class PeriodicTask:
+    def __init__(
+            self,
+            name: str,
+            func: Callable[[], Awaitable],
+            interval: float,
+            mode: ScheduleMode = ScheduleMode.FixedRate,
+            overrun: OverrunPolicy = OverrunPolicy.Skip,
+            jitter: float = 0,
+            phase_key: str = None,
+            immediate: bool = False,
+            fail_fast: bool = False,
+            owner: str = None,
+    ):
+        self._name = name
+        self._func = func
+        self._interval = interval
+        self._mode = mode
+        self._overrun = overrun
+        self._jitter = jitter
+        self._phase_key = phase_key
+        self._immediate = immediate
+        self._fail_fast = fail_fast
+        self._owner = owner
+        self._stats = TaskStats()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def stats(self) -> TaskStats:
+        return self._stats
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_run = loop.time() + (0 if self._immediate else self.get_phase())
+        while True:
+            await asyncio.sleep(max(next_run - loop.time(), 0))
+            started = loop.time()
+            self._stats.last_lag = max(started - next_run, 0)
+            self._stats.max_lag = max(self._stats.max_lag, self._stats.last_lag)
+            try:
+                await self._func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as ex:
+                self._stats.failures += 1
+                if self._fail_fast:
+                    raise
+                logger.error(
+                    f'Periodic task {self._name} failed: {ex!r}', extra=extra(self._owner, traceback=traceback())
+                )
+            finally:
+                self._record_duration(loop.time() - started)
+
+            next_run = self._get_next_run(next_run, loop.time())
+
+    def get_phase(self) -> float:
+        if not self._jitter:
+            return 0
+        if self._phase_key is None:
+            return random.random() * self._interval * self._jitter
+        return zlib.crc32(f'{self._phase_key}:{self._name}'.encode()) / PHASE_RESOLUTION * self._interval * self._jitter
+
+    def _get_next_run(self, scheduled: float, finished: float) -> float:
+        if self._mode == ScheduleMode.FixedDelay:
+            return finished + self._interval
+
+        next_run = scheduled + self._interval
+        if finished <= next_run:
+            return next_run
+
+        self._stats.overruns += 1
+        logger.warning(
+            f'Periodic task {self._name} overran its {self._interval}s interval by {finished - next_run:.3f}s',
+            extra=extra(self._owner),
+        )
+        if self._overrun == OverrunPolicy.RunNow:
+            return finished
+
+        missed = int((finished - next_run) // self._interval) + 1
+        self._stats.skipped += missed
+        return next_run + missed * self._interval
+
+    def _record_duration(self, duration: float):
+        self._stats.runs += 1
+        self._stats.last_duration = duration
+        self._stats.max_duration = max(self._stats.max_duration, duration)
+        self._stats.total_duration += duration
+
+
+class Scheduler:
+    def __init__(self, owner: str = None):
+        self._owner = owner
+        self._tasks: List[PeriodicTask] = []
+        self._running: List[asyncio.Task] = []
+
+    @property
+    def stats(self) -> Dict[str, TaskStats]:
+        return {task.name: task.stats for task in self._tasks}
+
+    def add(self, name: str, func: Callable[[], Awaitable], interval: float, **options) -> PeriodicTask:
+        task = PeriodicTask(name, func, interval, owner=self._owner, **options)
+        self._tasks.append(task)
+        return task
+
+    async def run(self):
+        self._running = [asyncio.create_task(task.run(), name=task.name) for task in self._tasks]
+        try:
+            done, _ = await asyncio.wait(self._running, return_when=asyncio.FIRST_EXCEPTION)
+            [task.result() for task in done]
+        finally:
+            await self.stop()
+
+    async def stop(self, timeout: Optional[float] = None):
+        running = [task for task in self._running if not task.done()]
+        [task.cancel() for task in running]
+        if running:
+            await asyncio.wait(running, timeout=timeout)
+        [task.exception() for task in self._running if task.done() and not task.cancelled()]
+        self._running = []
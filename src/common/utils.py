@@ -1,10 +1,9 @@
 import asyncio
-import threading
 import time
 from enum import Enum
 from functools import lru_cache
 from itertools import islice
-from typing import Any, List, Tuple, Iterable, Iterator, Optional
+from typing import Any, List, Tuple, Iterable, Iterator
 
 from envclasses import load_env
 
@@ -22,13 +21,6 @@ class BaseEnum(Enum):
         return [(member.value, member.name) for member in cls]
 
 
-def use_thread(func):
-    def inner_function(*args, **kwargs):
-        return func(*args, **kwargs)
-
-    threading.Thread(target=inner_function, daemon=True).start()
-
-
 # TODO: Refactor
 def get_log_extra(
         account: str = None,
@@ -36,6 +28,7 @@ def get_log_extra(
         request: str = None,
         response: str = None,
         status_code: int = None,
+        elapsed: float = None,
 ) -> dict:
     extra = {}
     if account:
@@ -48,24 +41,12 @@ def get_log_extra(
         extra['response'] = response
     if status_code:
         extra['status_code'] = status_code
+    if elapsed is not None:
+        extra['elapsed'] = elapsed
 
     return extra
 
 
-def invoke_forever(interval: float):
-    def inner_function(coro_func):
-        async def wrapper(*args, **kwargs):
-            while True:
-                then = time.time()
-                await coro_func(*args, **kwargs)
-                elapsed = time.time() - then
-                await asyncio.sleep(interval - elapsed)
-
-        return wrapper
-
-    return inner_function
-
-
 def invoke_until(interval: float, expected_result: Any):
     def inner_function(coro_func):
         async def wrapper(*args, **kwargs):
@@ -88,10 +69,6 @@ def to_chunks(iterable: Iterable, size: int) -> Iterator[Tuple[Any, ...]]:
     return iter(lambda: tuple(islice(iterable, size)), ())
 
 
-def find_index(elem: Any, iterable: Iterable[Any]) -> Optional[int]:
-    return [index if elem == item else None for index, item in iterable][0]
-
-
 @lru_cache(maxsize=4096)
 def to_rub(amount: float, currency_rate: float, decimal: int) -> float:
     return round(amount * currency_rate, decimal)
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.core.handlers.wsgi import WSGIRequest
 from django.db.models import QuerySet
 
+from common.cache import MARKET_KEYS_CACHE
 from .models import Key
 
 
@@ -22,7 +23,9 @@ class KeyAdmin(admin.ModelAdmin):
     @admin.action(description='Activate selected keys')
     def activate_keys(self, request: WSGIRequest, keys: QuerySet[Key]):
         keys.update(active=True)
+        MARKET_KEYS_CACHE.invalidate()
 
     @admin.action(description='Deactivate selected keys')
     def deactivate_keys(self, request: WSGIRequest, keys: QuerySet[Key]):
         keys.update(active=False)
+        MARKET_KEYS_CACHE.invalidate()
@@ -1,6 +1,8 @@
 import logging
-from typing import Final, Iterable
+import time
+from typing import Final, Iterable, Tuple, Set, Union
 
+import orjson
 from aiohttp import ClientResponse
 from django.conf import settings
 
@@ -13,62 +15,77 @@ from market.domain.models import *
 logger = logging.getLogger(__name__)
 
 API_KEY_QUERY_PARAM: Final[str] = 'key'
+FAST_DECODE_URLS: Final[Set[MarketUrls]] = {MarketUrls.GET_ITEMS_BY_HASH_NAME}
 
 
 class MarketApi:
-    def __init__(self, creds: MarketCredentials, client: AsyncHttpClient):
+    def __init__(self, creds: MarketCredentials, client: AsyncHttpClient,
+                 fast_decode_urls: Set[MarketUrls] = FAST_DECODE_URLS):
         self._creds = creds
         self._client = client
         self._settings = settings.MARKET_SETTINGS
+        self._fast_decode_urls = fast_decode_urls
 
     async def set_steam_api_key(self, steam_key: str) -> SetSteamApiKeyResponse:
-        response = await self._get_api(MarketUrls.SET_STEAM_API_KEY, steam_api_key=steam_key)
-        logger.info(f'Set steam api key', extra=await self._extra(response))
+        response, body, elapsed = await self._get_api(MarketUrls.SET_STEAM_API_KEY, steam_api_key=steam_key)
+        self._log('Set steam api key', response, body, elapsed)
 
-        return SetSteamApiKeyResponse(**await response.json())
+        return SetSteamApiKeyResponse(**orjson.loads(body))
 
     async def ping(self) -> PingResponse:
-        response = await self._get_api(MarketUrls.PING)
-        logger.info('Sent market ping', extra=await self._extra(response))
+        response, body, elapsed = await self._get_api(MarketUrls.PING)
+        self._log('Sent market ping', response, body, elapsed)
 
-        return PingResponse(**await response.json())
+        return PingResponse(**orjson.loads(body))
 
     async def test(self) -> TestResponse:
-        response = await self._get_api(MarketUrls.TEST)
-        logger.info('Sent market test', extra=await self._extra(response))
+        response, body, elapsed = await self._get_api(MarketUrls.TEST)
+        self._log('Sent market test', response, body, elapsed)
 
-        return TestResponse(**await response.json())
+        return TestResponse(**orjson.loads(body))
 
     async def get_inventory(self) -> MyInventoryResponse:
-        response = await self._get_api(MarketUrls.GET_INVENTORY)
-        logger.info('Get inventory', extra=await self._extra(response))
+        response, body, elapsed = await self._get_api(MarketUrls.GET_INVENTORY)
+        self._log('Get inventory', response, body, elapsed)
 
-        return MyInventoryResponse(**await response.json())
+        return MyInventoryResponse(**orjson.loads(body))
 
     async def update_inventory(self) -> UpdateInventoryResponse:
-        response = await self._get_api(MarketUrls.UPDATE_INVENTORY)
-        logger.info('Update inventory', extra=await self._extra(response))
+        response, body, elapsed = await self._get_api(MarketUrls.UPDATE_INVENTORY)
+        self._log('Update inventory', response, body, elapsed)
 
-        return UpdateInventoryResponse(**await response.json())
+        return UpdateInventoryResponse(**orjson.loads(body))
 
-    async def get_items_by_hash_name(self, key: str, hash_names: Iterable[str]):
+    async def get_items_by_hash_name(
+            self,
+            key: str,
+            hash_names: Iterable[str],
+    ) -> Union[GetItemsByHashNameResponse, FastGetItemsByHashNameResponse]:
         params = {'key': key, 'list_hash_name[]': hash_names}
-        response = await self._get_api(MarketUrls.GET_ITEMS_BY_HASH_NAME, **params)
-        logger.info('Get items by hash names', extra=await self._extra(response))
+        response, body, elapsed = await self._get_api(MarketUrls.GET_ITEMS_BY_HASH_NAME, **params)
+        self._log('Get items by hash names', response, body, elapsed)
 
-        return GetItemsByHashNameResponse(**await response.json())
+        if MarketUrls.GET_ITEMS_BY_HASH_NAME in self._fast_decode_urls:
+            return FastGetItemsByHashNameResponse.parse_json(orjson.loads(body))
+        return GetItemsByHashNameResponse(**orjson.loads(body))
 
-    async def _extra(self, response: ClientResponse) -> dict:
-        json = await response.json()
+    def _log(self, message: str, response: ClientResponse, body: bytes, elapsed: float, level: int = logging.INFO):
+        if logger.isEnabledFor(level):
+            logger.log(level, message, extra=self._extra(response, body, elapsed))
+
+    def _extra(self, response: ClientResponse, body: bytes, elapsed: float) -> dict:
         return extra(
             self._creds.login,
             request=str(response.url)[:LOG_MAX_LENGTH],
-            response=str(json)[:LOG_MAX_LENGTH],
-            status_code=response.status
+            response=body[:LOG_MAX_LENGTH].decode(errors='ignore'),
+            status_code=response.status,
+            elapsed=elapsed,
         )
 
-    async def _get_api(self, api: MarketUrls, **kwargs) -> ClientResponse:
-        return await self._client.get(self._get_uri(api), self._get_params(**kwargs))
+    async def _get_api(self, api: MarketUrls, **kwargs) -> Tuple[ClientResponse, bytes, float]:
+        started = time.perf_counter()
+        response, body = await self._client.get(self._get_uri(api), self._get_params(**kwargs))
+        return response, body, round(time.perf_counter() - started, 4)
 
     def _get_uri(self, api: MarketUrls) -> str:
         return self._settings.host + api.value
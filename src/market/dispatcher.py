@@ -0,0 +1,180 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Tuple, List, Dict, Optional, Union
+
+from aiohttp import ClientError
+from asgiref.sync import sync_to_async
+
+from common.cache import MARKET_KEYS_CACHE
+from common.http.client import DIRECT_PROXY_LABEL
+from common.http.metrics import HTTP_METRICS
+from common.models import ProxyCredentials
+from common.utils import get_log_extra as extra
+from market.api import MarketApi
+from market.domain.constants import *
+from market.domain.enums import MarketUrls
+from market.domain.models import GetItemsByHashNameResponse, FastGetItemsByHashNameResponse
+from market.models import Key
+from market.pool import KeyPool
+
+logger = logging.getLogger(__name__)
+
+ItemsByHashNameResponse = Union[GetItemsByHashNameResponse, FastGetItemsByHashNameResponse]
+
+
+@dataclass
+class ChunkJob:
+    login: str
+    proxy: str
+    market_api: MarketApi
+    hash_names: Tuple[str, ...]
+
+
+@dataclass
+class DispatcherStats:
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    in_flight: int = 0
+    requests: int = 0
+    retries: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    proxies_in_flight: Dict[str, int] = field(default_factory=dict)
+
+
+class ChunkDispatcher:
+    def __init__(
+            self,
+            key_pool: KeyPool,
+            proxy_concurrency: int = PROXY_CONCURRENCY_LIMIT,
+            queue_size: int = DISPATCHER_QUEUE_SIZE,
+            timeout: float = DISPATCHER_REQUEST_TIMEOUT,
+            max_attempts: int = KEY_MAX_ATTEMPTS,
+            backoff: float = DISPATCHER_BACKOFF,
+            max_backoff: float = DISPATCHER_MAX_BACKOFF,
+    ):
+        self._key_pool = key_pool
+        self._proxy_concurrency = proxy_concurrency
+        self._queue_size = queue_size
+        self._timeout = timeout
+        self._max_attempts = max_attempts
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._proxy_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats = DispatcherStats()
+
+    @property
+    def stats(self) -> dict:
+        return asdict(self._stats)
+
+    async def dispatch(self, jobs: List[ChunkJob]) -> List[ItemsByHashNameResponse]:
+        results = []
+        if not jobs:
+            return results
+
+        queue = asyncio.Queue(self._queue_size)
+        workers_count = len({job.proxy for job in jobs}) * self._proxy_concurrency
+        workers = [asyncio.create_task(self._work(queue, results)) for _ in range(min(workers_count, len(jobs)))]
+        try:
+            for job in jobs:
+                await queue.put(job)
+                self._update_queue_depth(queue)
+            await queue.join()
+        finally:
+            [worker.cancel() for worker in workers]
+            self._update_queue_depth(queue)
+
+        return results
+
+    async def _work(self, queue: asyncio.Queue, results: List[ItemsByHashNameResponse]):
+        while True:
+            job = await queue.get()
+            self._update_queue_depth(queue)
+            try:
+                if response := await self._process(job):
+                    results.append(response)
+            except Exception as ex:
+                logger.error(f'Failed to process chunk: {ex!r}', extra=extra(job.login))
+            finally:
+                queue.task_done()
+
+    async def _process(self, job: ChunkJob) -> Optional[ItemsByHashNameResponse]:
+        key = None
+        for attempt in range(self._max_attempts):
+            if attempt:
+                self._stats.retries += 1
+                proxy_label = self._get_proxy_label(job.proxy)
+                HTTP_METRICS.record_retry(MarketUrls.GET_ITEMS_BY_HASH_NAME.value, key, proxy_label)
+                await asyncio.sleep(random.uniform(0, min(self._backoff * 2 ** attempt, self._max_backoff)))
+
+            released = True
+            try:
+                async with self._get_proxy_semaphore(job.proxy):
+                    if not (key := await self._key_pool.acquire()):
+                        logger.warning('No active market keys', extra=extra(job.login))
+                        break
+                    released = False
+                    response, elapsed = await self._call_api(job, key)
+
+                if response and response.error == BAD_KEY_ERROR_MESSAGE:
+                    logger.warning(f'Bad key error for {key} key', extra=extra(job.login))
+                    self._key_pool.remove(key)
+                    released = True
+                    await self._deactivate_market_key(key)
+                    continue
+
+                failed = not response or not response.success
+                self._key_pool.release(key, elapsed, failed=failed)
+                released = True
+                if not failed:
+                    return response
+            finally:
+                if not released:
+                    self._key_pool.release(key, 0, failed=True)
+
+        self._stats.failures += 1
+        return None
+
+    async def _call_api(self, job: ChunkJob, key: str) -> Tuple[Optional[ItemsByHashNameResponse], float]:
+        self._stats.requests += 1
+        self._stats.in_flight += 1
+        self._stats.proxies_in_flight[job.proxy] = self._stats.proxies_in_flight.get(job.proxy, 0) + 1
+        then = time.monotonic()
+        try:
+            response = await asyncio.wait_for(job.market_api.get_items_by_hash_name(key, job.hash_names), self._timeout)
+            if not response.success:
+                logger.info(f'Market error for {key} key: {response.error}', extra=extra(job.login))
+        except asyncio.TimeoutError:
+            self._stats.timeouts += 1
+            logger.warning(f'Get items by hash names timed out with {key} key', extra=extra(job.login))
+            response = None
+        except (ClientError, ValueError) as ex:
+            logger.warning(f'Failed to get items by hash names with {key} key: {ex!r}', extra=extra(job.login))
+            response = None
+        finally:
+            self._stats.in_flight -= 1
+            self._stats.proxies_in_flight[job.proxy] -= 1
+
+        return response, time.monotonic() - then
+
+    def _get_proxy_semaphore(self, proxy: str) -> asyncio.Semaphore:
+        if proxy not in self._proxy_semaphores:
+            self._proxy_semaphores[proxy] = asyncio.Semaphore(self._proxy_concurrency)
+        return self._proxy_semaphores[proxy]
+
+    @staticmethod
+    def _get_proxy_label(proxy: str) -> str:
+        return ProxyCredentials.parse_str(proxy).label if proxy else DIRECT_PROXY_LABEL
+
+    def _update_queue_depth(self, queue: asyncio.Queue):
+        self._stats.queue_depth = queue.qsize()
+        self._stats.max_queue_depth = max(self._stats.max_queue_depth, queue.qsize())
+
+    @sync_to_async
+    def _deactivate_market_key(self, key: str):
+        logger.info(f'Deactivate market key: {key}')
+        Key.objects.filter(key=key).update(active=False)
+        MARKET_KEYS_CACHE.invalidate()
@@ -3,3 +3,16 @@ from typing import Final
 GET_ITEMS_BY_HASH_NAME_LIMIT: Final[int] = 50
 BAD_KEY_ERROR_MESSAGE: Final[str] = 'Bad KEY'
 LOG_MAX_LENGTH: Final[int] = 250
+KEY_REQUESTS_PER_SECOND_LIMIT: Final[float] = 5
+KEY_REQUESTS_BURST_LIMIT: Final[float] = 5
+KEY_COOLDOWN: Final[float] = 5
+KEY_MAX_COOLDOWN: Final[float] = 300
+KEY_EWMA_ALPHA: Final[float] = 0.2
+KEY_MAX_ATTEMPTS: Final[int] = 3
+KEY_CONCURRENCY_LIMIT: Final[int] = 2
+PROXY_CONCURRENCY_LIMIT: Final[int] = 4
+DISPATCHER_QUEUE_SIZE: Final[int] = 100
+DISPATCHER_REQUEST_TIMEOUT: Final[float] = 15
+DISPATCHER_BACKOFF: Final[float] = 0.5
+DISPATCHER_MAX_BACKOFF: Final[float] = 10
+LISTING_STORE_COMPACT_THRESHOLD: Final[int] = 10000
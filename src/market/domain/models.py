@@ -1,7 +1,12 @@
-from typing import Any, List, Dict
+import logging
+from typing import Any, List, Dict, NamedTuple, Optional, Tuple, Iterable
 
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
+ListingRow = Tuple[int, int, int, int, Optional[float]]
+
 
 class MarketCredentials(BaseModel):
     login: str
@@ -74,3 +79,53 @@ class GetItemsByHashNameResponse(BaseMarketResponse):
     currency: str = None
     data: Dict[str, List[MarketItem]] = None
     error: str = None
+
+    def listings(self) -> Dict[str, List[ListingRow]]:
+        return {
+            hash_name: [(int(item.id), item.price, item.class_id, item.instance, item.extra.float_) for item in items]
+            for hash_name, items in (self.data or {}).items()
+        }
+
+
+class FastGetItemsByHashNameResponse(NamedTuple):
+    success: bool
+    currency: str = None
+    data: Dict[str, List[ListingRow]] = None
+    error: str = None
+
+    @staticmethod
+    def parse_json(json: dict):
+        data = json.get('data')
+        return FastGetItemsByHashNameResponse(
+            success=bool(json.get('success')),
+            currency=json.get('currency'),
+            data={
+                hash_name: FastGetItemsByHashNameResponse._to_rows(hash_name, items)
+                for hash_name, items in data.items()
+            } if isinstance(data, dict) else None,
+            error=json.get('error'),
+        )
+
+    def listings(self) -> Dict[str, List[ListingRow]]:
+        return self.data or {}
+
+    @staticmethod
+    def _to_rows(hash_name: str, items: Iterable[dict]) -> List[ListingRow]:
+        rows = []
+        for item in items or ():
+            try:
+                rows.append(FastGetItemsByHashNameResponse._to_row(item))
+            except (KeyError, TypeError, ValueError, AttributeError) as ex:
+                logger.warning(f'Skip malformed {hash_name} listing: {ex!r}')
+        return rows
+
+    @staticmethod
+    def _to_row(item: dict) -> ListingRow:
+        float_ = (item.get('extra') or {}).get('float')
+        return (
+            int(item['id']),
+            int(item['price']),
+            int(item['class']),
+            int(item['instance']),
+            None if float_ is None else float(float_),
+        )
@@ -0,0 +1,62 @@
+import json
+import random
+import time
+
+import orjson
+from django.core.management.base import BaseCommand
+
+from market.domain.constants import GET_ITEMS_BY_HASH_NAME_LIMIT, LOG_MAX_LENGTH
+from market.domain.models import GetItemsByHashNameResponse, FastGetItemsByHashNameResponse
+
+
+class Command(BaseCommand):
+    help = 'Measures CPU time per get-items-by-hash-name response for the validated and the fast decoding'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--names', type=int, default=GET_ITEMS_BY_HASH_NAME_LIMIT)
+        parser.add_argument('--listings', type=int, default=30)
+        parser.add_argument('--repeat', type=int, default=200)
+
+    def handle(self, *args, names: int, listings: int, repeat: int, **options):
+        body = self._make_body(names, listings)
+        self.stdout.write(f'Response: {names} names x {listings} listings, {len(body)} bytes')
+
+        validated = self._measure(self._decode_validated, body, repeat)
+        fast = self._measure(self._decode_fast, body, repeat)
+        self.stdout.write(f'Validated: {validated * 1000:.3f} ms/response')
+        self.stdout.write(f'Fast: {fast * 1000:.3f} ms/response ({validated / fast:.1f}x)')
+
+    @staticmethod
+    def _decode_validated(body: bytes):
+        response = GetItemsByHashNameResponse(**json.loads(body))
+        excerpt = str(json.loads(body))[:LOG_MAX_LENGTH]
+        return response.listings(), excerpt
+
+    @staticmethod
+    def _decode_fast(body: bytes):
+        response = FastGetItemsByHashNameResponse.parse_json(orjson.loads(body))
+        excerpt = body[:LOG_MAX_LENGTH].decode(errors='ignore')
+        return response.listings(), excerpt
+
+    @staticmethod
+    def _measure(decode, body: bytes, repeat: int) -> float:
+        then = time.process_time()
+        [decode(body) for _ in range(repeat)]
+        return (time.process_time() - then) / repeat
+
+    @staticmethod
+    def _make_body(names: int, listings: int) -> bytes:
+        data = {
+            f'Item | Skin {name} (Field-Tested)': [
+                {
+                    'id': str(random.randint(10 ** 9, 10 ** 10)),
+                    'price': random.randint(100, 100000),
+                    'class': random.randint(10 ** 8, 10 ** 9),
+                    'instance': random.randint(0, 10 ** 9),
+                    'extra': {'float': str(random.random()), 'phase': None},
+                }
+                for _ in range(listings)
+            ]
+            for name in range(names)
+        }
+        return orjson.dumps({'success': True, 'currency': 'RUB', 'data': data})
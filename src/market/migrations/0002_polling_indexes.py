@@ -0,0 +1,18 @@
+# Generated by Django 4.1 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='key',
+            name='active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+    ]
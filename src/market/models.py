@@ -3,7 +3,7 @@ from django.db import models
 
 class Key(models.Model):
     key = models.CharField(max_length=120)
-    active = models.BooleanField(default=True)
+    active = models.BooleanField(default=True, db_index=True)
 
     def __str__(self):
         return self.key
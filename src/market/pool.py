@@ -0,0 +1,102 @@
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, Optional, List
+
+from market.domain.constants import *
+
+
+@dataclass
+class KeyState:
+    key: str
+    tokens: float
+    updated: float
+    in_flight: int = 0
+    latency: float = 0
+    error_rate: float = 0
+    failures: int = 0
+    cooldown_until: float = 0
+
+    def refill(self, now: float, rate: float, burst: float):
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    def is_available(self, now: float, concurrency: int) -> bool:
+        return self.cooldown_until <= now and self.tokens >= 1 and self.in_flight < concurrency
+
+    def get_wait_time(self, now: float, rate: float) -> float:
+        return max(self.cooldown_until - now, (1 - self.tokens) / rate, 0)
+
+
+class KeyPool:
+    def __init__(
+            self,
+            rate: float = KEY_REQUESTS_PER_SECOND_LIMIT,
+            burst: float = KEY_REQUESTS_BURST_LIMIT,
+            concurrency: int = KEY_CONCURRENCY_LIMIT,
+            cooldown: float = KEY_COOLDOWN,
+            max_cooldown: float = KEY_MAX_COOLDOWN,
+            alpha: float = KEY_EWMA_ALPHA,
+    ):
+        self._rate = rate
+        self._burst = burst
+        self._concurrency = concurrency
+        self._cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._alpha = alpha
+        self._keys: Dict[str, KeyState] = {}
+        self._released: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, keys: Iterable[str]):
+        now = time.monotonic()
+        keys = set(keys)
+        self._keys = {key: self._keys.get(key) or KeyState(key, self._burst, now) for key in keys}
+
+    def remove(self, key: str):
+        self._keys.pop(key, None)
+        if self._released:
+            self._released.set()
+
+    async def acquire(self) -> Optional[str]:
+        self._released = self._released or asyncio.Event()
+        while self._keys:
+            now = time.monotonic()
+            [state.refill(now, self._rate, self._burst) for state in self._keys.values()]
+            available = [state for state in self._keys.values() if state.is_available(now, self._concurrency)]
+            if available:
+                state = min(available, key=lambda s: (s.in_flight, s.error_rate, s.latency, -s.tokens))
+                state.tokens -= 1
+                state.in_flight += 1
+                return state.key
+
+            idle = [state for state in self._keys.values() if state.in_flight < self._concurrency]
+            self._released.clear()
+            try:
+                timeout = min(state.get_wait_time(now, self._rate) for state in idle) if idle else None
+                await asyncio.wait_for(self._released.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+        return None
+
+    def release(self, key: str, latency: float, failed: bool = False):
+        if not (state := self._keys.get(key)):
+            return
+
+        state.in_flight = max(state.in_flight - 1, 0)
+        if self._released:
+            self._released.set()
+        state.error_rate += self._alpha * (float(failed) - state.error_rate)
+        if failed:
+            state.failures += 1
+            cooldown = min(self._cooldown * 2 ** (state.failures - 1), self._max_cooldown)
+            state.cooldown_until = time.monotonic() + cooldown
+        else:
+            state.failures = 0
+            state.latency += self._alpha * (latency - state.latency)
+
+    def stats(self) -> List[dict]:
+        return [asdict(state) for state in self._keys.values()]
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from common.cache import MARKET_KEYS_CACHE
+from .models import Key
+
+
+@receiver([post_save, post_delete], sender=Key)
+def invalidate_market_keys(sender, **kwargs):
+    MARKET_KEYS_CACHE.invalidate_on_commit()
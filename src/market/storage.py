@@ -0,0 +1,100 @@
+import math
+from array import array
+from typing import Dict, Tuple, Optional, Iterable, List, Set
+
+from market.domain.constants import LISTING_STORE_COMPACT_THRESHOLD
+from market.domain.models import ListingRow
+
+
+class ListingStore:
+    def __init__(self, compact_threshold: int = LISTING_STORE_COMPACT_THRESHOLD):
+        self._compact_threshold = compact_threshold
+        self._ids = array('q')
+        self._prices = array('q')
+        self._classes = array('q')
+        self._instances = array('q')
+        self._floats = array('d')
+        self._segments: Dict[str, Tuple[int, int]] = {}
+        self._positions: Dict[int, Tuple[str, int]] = {}
+        self._garbage = 0
+
+    def __contains__(self, hash_name: str) -> bool:
+        return hash_name in self._segments
+
+    def __len__(self) -> int:
+        return len(self._segments)
+
+    @property
+    def hash_names(self) -> Set[str]:
+        return set(self._segments)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self._ids, self._prices, self._classes, self._instances, self._floats)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def put(self, hash_name: str, rows: Iterable[ListingRow]) -> bool:
+        rows = sorted(rows, key=lambda row: row[1])
+        ids = [row[0] for row in rows]
+        prices = [row[1] for row in rows]
+        if hash_name in self._segments and self.get_ids(hash_name) == ids:
+            start, _ = self._segments[hash_name]
+            changed = self._prices[start] != prices[0] if prices else False
+            self._prices[start:start + len(prices)] = array('q', prices)
+            return changed
+
+        self._remove(hash_name)
+        self._segments[hash_name] = (len(self._ids), len(rows))
+        self._ids.extend(ids)
+        self._prices.extend(prices)
+        self._classes.extend(row[2] for row in rows)
+        self._instances.extend(row[3] for row in rows)
+        self._floats.extend(math.nan if row[4] is None else row[4] for row in rows)
+        self._positions.update((id_, (hash_name, rank)) for rank, id_ in enumerate(ids))
+
+        if self._garbage > max(self._compact_threshold, len(self._ids) - self._garbage):
+            self._compact()
+
+        return True
+
+    def evict(self, hash_names: Set[str]):
+        [self._remove(hash_name) for hash_name in list(self._segments) if hash_name not in hash_names]
+        if self._garbage > max(self._compact_threshold, len(self._ids) - self._garbage):
+            self._compact()
+
+    def get_ids(self, hash_name: str) -> List[int]:
+        start, count = self._segments[hash_name]
+        return self._ids[start:start + count].tolist()
+
+    def get_min_price(self, hash_name: str) -> Optional[int]:
+        start, count = self._segments[hash_name]
+        return self._prices[start] if count else None
+
+    def get_count(self, hash_name: str) -> int:
+        return self._segments[hash_name][1]
+
+    def get_position(self, market_id: int, hash_name: str) -> Optional[int]:
+        position = self._positions.get(market_id)
+        return position[1] + 1 if position and position[0] == hash_name else None
+
+    def _remove(self, hash_name: str):
+        if hash_name not in self._segments:
+            return
+
+        start, count = self._segments.pop(hash_name)
+        for id_ in self._ids[start:start + count]:
+            if self._positions.get(id_, (None,))[0] == hash_name:
+                del self._positions[id_]
+        self._garbage += count
+
+    def _compact(self):
+        columns = (self._ids, self._prices, self._classes, self._instances, self._floats)
+        compacted = tuple(array(column.typecode) for column in columns)
+        segments = {}
+        for hash_name, (start, count) in self._segments.items():
+            segments[hash_name] = (len(compacted[0]), count)
+            [new.extend(old[start:start + count]) for new, old in zip(compacted, columns)]
+
+        self._ids, self._prices, self._classes, self._instances, self._floats = compacted
+        self._segments = segments
+        self._garbage = 0
@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+from common.db import set_sqlite_pragmas
 
 
 class SettingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'settings'
+
+    def ready(self):
+        connection_created.connect(set_sqlite_pragmas, dispatch_uid='set_sqlite_pragmas')
+
+        from . import signals
@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from logging import LogRecord
+from typing import Dict, Final, Iterable, List, Optional, Tuple
+
+AGGREGATE_INTERVAL: Final[float] = 60
+AGGREGATED_ATTR: Final[str] = 'aggregated'
+SAMPLE_ATTRS: Final[Tuple[str, ...]] = ('account', 'request', 'response', 'status_code')
+
+AggregateKey = Tuple[str, str, Optional[str]]
+
+
+def is_error_record(record: LogRecord) -> bool:
+    return getattr(record, 'status_code', 0) >= 400
+
+
+@dataclass
+class Aggregate:
+    started: float
+    count: int = 0
+    errors: int = 0
+    elapsed: List[float] = field(default_factory=list)
+    last: Optional[LogRecord] = None
+
+    def add(self, record: LogRecord):
+        self.count += 1
+        if is_error_record(record):
+            self.errors += 1
+        if (elapsed := getattr(record, 'elapsed', None)) is not None:
+            self.elapsed.append(elapsed)
+        self.last = record
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        if not self.elapsed:
+            return None
+        values = sorted(self.elapsed)
+        return round(values[min(int(len(values) * percentile), len(values) - 1)], 4)
+
+
+class LogAggregator:
+    def __init__(self, messages: Iterable[str], interval: float = AGGREGATE_INTERVAL):
+        self._messages = tuple(messages)
+        self._interval = interval
+        self._aggregates: Dict[AggregateKey, Aggregate] = {}
+        self._lock = threading.Lock()
+
+    def add(self, record: LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        message = self._match(record)
+        if message is None:
+            return True
+
+        key = (record.name, message, getattr(record, 'account', None))
+        with self._lock:
+            if key not in self._aggregates:
+                self._aggregates[key] = Aggregate(time.monotonic())
+            self._aggregates[key].add(record)
+
+        return is_error_record(record)
+
+    def pop_summaries(self, force: bool = False) -> List[LogRecord]:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                key for key, aggregate in self._aggregates.items() if force or now - aggregate.started >= self._interval
+            ]
+            aggregates = [(key, self._aggregates.pop(key)) for key in expired]
+
+        return [self._summarize(key, aggregate, now) for key, aggregate in aggregates]
+
+    def _match(self, record: LogRecord) -> Optional[str]:
+        if not isinstance(record.msg, str) or not record.msg.startswith(self._messages):
+            return None
+        return next(message for message in self._messages if record.msg.startswith(message))
+
+    @staticmethod
+    def _summarize(key: AggregateKey, aggregate: Aggregate, now: float) -> LogRecord:
+        name, message, account = key
+        last = aggregate.last
+        summary = logging.LogRecord(
+            name, last.levelno, last.pathname, last.lineno,
+            f'{message}: {aggregate.count} records in {now - aggregate.started:.0f}s', None, None,
+        )
+        summary.__dict__.update({
+            attr: getattr(last, attr) for attr in SAMPLE_ATTRS if hasattr(last, attr)
+        })
+        summary.__dict__.update(
+            aggregated=True,
+            count=aggregate.count,
+            errors=aggregate.errors,
+            elapsed_p50=aggregate.get_percentile(0.5),
+            elapsed_p95=aggregate.get_percentile(0.95),
+        )
+        return summary
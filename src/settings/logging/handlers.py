@@ -1,8 +1,175 @@
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass
 from logging import LogRecord
+from queue import Queue, Full, Empty
+from typing import Final, List, Optional, Tuple, Iterable
 
-from logstash import TCPLogstashHandler
+from .aggregators import LogAggregator, AGGREGATE_INTERVAL
 
+LOGSTASH_QUEUE_SIZE: Final[int] = 10000
+LOGSTASH_QUEUE_PRESSURE: Final[float] = 0.8
+LOGSTASH_BATCH_SIZE: Final[int] = 500
+LOGSTASH_FLUSH_INTERVAL: Final[float] = 1
+LOGSTASH_CONNECT_TIMEOUT: Final[float] = 3
+LOGSTASH_RECONNECT_INTERVAL: Final[float] = 5
+LOGSTASH_CLOSE_TIMEOUT: Final[float] = 5
 
-class StrTCPLogstashHandler(TCPLogstashHandler):
-    def makePickle(self, record: LogRecord):
-        return str.encode(self.formatter.format(record)) + b'\n'
+
+@dataclass
+class LogstashStats:
+    queued: int = 0
+    sent: int = 0
+    batches: int = 0
+    dropped_full: int = 0
+    dropped_pressure: int = 0
+    dropped_disconnected: int = 0
+    connection_errors: int = 0
+
+
+class BatchingLogstashHandler(logging.Handler):
+    def __init__(
+            self,
+            host: str,
+            port: int,
+            queue_size: int = LOGSTASH_QUEUE_SIZE,
+            queue_pressure: float = LOGSTASH_QUEUE_PRESSURE,
+            batch_size: int = LOGSTASH_BATCH_SIZE,
+            flush_interval: float = LOGSTASH_FLUSH_INTERVAL,
+            connect_timeout: float = LOGSTASH_CONNECT_TIMEOUT,
+            reconnect_interval: float = LOGSTASH_RECONNECT_INTERVAL,
+            aggregate: Iterable[str] = (),
+            aggregate_interval: float = AGGREGATE_INTERVAL,
+            level=logging.NOTSET,
+    ):
+        super().__init__(level)
+        self._address = (host, port)
+        self._queue_size = queue_size
+        self._pressure_size = int(queue_size * queue_pressure)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._connect_timeout = connect_timeout
+        self._reconnect_interval = reconnect_interval
+        self._aggregate = tuple(aggregate)
+        self._aggregate_interval = aggregate_interval
+        self._aggregator: Optional[LogAggregator] = None
+        self._stats = LogstashStats()
+        self._queue: Optional[Queue] = None
+        self._sender: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._socket: Optional[socket.socket] = None
+        self._reconnect_at = 0.0
+
+    @property
+    def stats(self) -> LogstashStats:
+        self._stats.queued = self._queue.qsize() if self._queue else 0
+        return self._stats
+
+    def emit(self, record: LogRecord):
+        queue = self._get_queue()
+        if self._aggregator and not self._aggregator.add(record):
+            return
+        if record.levelno < logging.WARNING and queue.qsize() >= self._pressure_size:
+            self._stats.dropped_pressure += 1
+            return
+
+        if line := self._format_line(record):
+            try:
+                queue.put_nowait(line)
+            except Full:
+                self._stats.dropped_full += 1
+
+    def close(self):
+        if self._sender and self._pid == os.getpid() and self._sender.is_alive():
+            try:
+                self._queue.put(None, timeout=LOGSTASH_CLOSE_TIMEOUT)
+            except Full:
+                pass
+            self._sender.join(LOGSTASH_CLOSE_TIMEOUT)
+        super().close()
+
+    def _get_queue(self) -> Queue:
+        if self._pid != os.getpid():
+            with self.lock:
+                if self._pid != os.getpid():
+                    self._start_sender()
+        return self._queue
+
+    def _format_line(self, record: LogRecord) -> Optional[bytes]:
+        try:
+            return self.format(record).encode(errors='replace') + b'\n'
+        except Exception:
+            self.handleError(record)
+            return None
+
+    def _start_sender(self):
+        self._aggregator = LogAggregator(self._aggregate, self._aggregate_interval) if self._aggregate else None
+        self._queue = Queue(self._queue_size)
+        self._socket = None
+        self._reconnect_at = 0.0
+        self._sender = threading.Thread(target=self._run, name='logstash-sender', daemon=True)
+        self._sender.start()
+        self._pid = os.getpid()
+
+    def _run(self):
+        stopped = False
+        while not stopped:
+            batch, stopped = self._get_batch()
+            if self._aggregator:
+                summaries = self._aggregator.pop_summaries(force=stopped)
+                batch += [line for line in map(self._format_line, summaries) if line]
+            if batch:
+                self._send(batch)
+        self._disconnect()
+
+    def _get_batch(self) -> Tuple[List[bytes], bool]:
+        batch = []
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            try:
+                line = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except Empty:
+                break
+            if line is None:
+                return batch, True
+            batch.append(line)
+
+        return batch, False
+
+    def _send(self, batch: List[bytes]):
+        if not self._socket and not self._connect():
+            self._stats.dropped_disconnected += len(batch)
+            return
+
+        try:
+            self._socket.sendall(b''.join(batch))
+        except OSError:
+            self._stats.connection_errors += 1
+            self._stats.dropped_disconnected += len(batch)
+            self._disconnect()
+            return
+
+        self._stats.sent += len(batch)
+        self._stats.batches += 1
+
+    def _connect(self) -> bool:
+        if time.monotonic() < self._reconnect_at:
+            return False
+
+        try:
+            self._socket = socket.create_connection(self._address, self._connect_timeout)
+        except OSError:
+            self._stats.connection_errors += 1
+            self._reconnect_at = time.monotonic() + self._reconnect_interval
+            return False
+
+        return True
+
+    def _disconnect(self):
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+        self._reconnect_at = time.monotonic() + self._reconnect_interval
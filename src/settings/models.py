@@ -1,8 +1,10 @@
 from decimal import Decimal
 
 from django.db import models
+from preferences import preferences
 from preferences.models import Preferences
 
+from common.cache import BOT_PREFERENCES_CACHE
 from common.validators import PERCENTAGE_VALIDATOR
 
 
@@ -16,5 +18,9 @@ class BotPreferences(Preferences):
     def __str__(self):
         return 'Bot preferences'
 
+    @staticmethod
+    def get_cached() -> 'BotPreferences':
+        return BOT_PREFERENCES_CACHE.get('preferences', lambda: preferences.BotPreferences)
+
     class Meta:
         verbose_name_plural = 'Bot preferences'
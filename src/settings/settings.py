@@ -33,9 +33,22 @@ class MarketSettings(BaseSettings):
     host: str = 'https://market.csgo.com'
 
 
+@envclass
+@dataclass
+class DatabaseSettings(BaseSettings):
+    engine: str = 'sqlite'
+    name: str = 'tm'
+    user: str = 'tm'
+    password: str = ''
+    host: str = 'localhost'
+    port: int = 5432
+    conn_max_age: int = 600
+
+
 SERVER_SETTINGS: DjangoSettings = DjangoSettings().from_env('DJANGO')
 ELK_SETTINGS: ELKSettings = ELKSettings().from_env('ELK')
 MARKET_SETTINGS: MarketSettings = MarketSettings().from_env('MARKET')
+DATABASE_SETTINGS: DatabaseSettings = DatabaseSettings().from_env('DATABASE')
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -110,10 +123,48 @@ WSGI_APPLICATION = 'settings.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
+SQLITE_DATABASE = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': DATA_DIR / 'db.sqlite3',
+    'OPTIONS': {
+        'timeout': 20,
+    },
+}
+
+# Connections are kept open between requests/bot cycles and pooled by pgbouncer (transaction mode),
+# so server-side cursors have to be disabled
+POSTGRES_DATABASE = {
+    'ENGINE': 'django.db.backends.postgresql',
+    'NAME': DATABASE_SETTINGS.name,
+    'USER': DATABASE_SETTINGS.user,
+    'PASSWORD': DATABASE_SETTINGS.password,
+    'HOST': DATABASE_SETTINGS.host,
+    'PORT': DATABASE_SETTINGS.port,
+    'CONN_MAX_AGE': DATABASE_SETTINGS.conn_max_age,
+    'CONN_HEALTH_CHECKS': True,
+    'DISABLE_SERVER_SIDE_CURSORS': True,
+}
+
 DATABASES = {
+    'default': POSTGRES_DATABASE if DATABASE_SETTINGS.engine == 'postgres' else SQLITE_DATABASE,
+}
+
+# Applied to every new SQLite connection. WAL lets readers work alongside the single writer
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 20000,
+    'cache_size': -64000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+
+# Shared by the web app, the importer and the bot processes through the data volume. Holds only small
+# version counters used to invalidate process-local caches
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': DATA_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': DATA_DIR / 'cache',
     }
 }
 
@@ -157,14 +208,17 @@ LOGGING = {
         },
         'logstash': {
             'level': 'INFO',
-            'class': 'settings.logging.handlers.StrTCPLogstashHandler',
+            'class': 'settings.logging.handlers.BatchingLogstashHandler',
             'formatter': 'json',
             'host': SERVER_SETTINGS.server_host,
             'port': 50000,
-            'version': 1,
-            'message_type': 'bot',
-            'fqdn': False,
-            'tags': ['bot'],
+            'aggregate': [
+                'Sent market ping',
+                'Sent market test',
+                'Get items by hash names',
+                'Trying to update market prices for',
+            ],
+            'aggregate_interval': 60,
         },
     },
     'loggers': {
@@ -172,6 +226,10 @@ LOGGING = {
             'handlers': ['logstash', 'console'],
             'level': 'ERROR',
         },
+        'common': {
+            'handlers': ['logstash', 'console'],
+            'level': 'INFO',
+        },
         'steam': {
             'handlers': ['logstash', 'console'],
             'level': 'DEBUG',
@@ -204,6 +262,9 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static/')
 
+# Uploaded files are shared with the background workers through the data volume
+MEDIA_ROOT = DATA_DIR / 'uploads'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
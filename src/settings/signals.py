@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from common.cache import BOT_PREFERENCES_CACHE
+from .models import BotPreferences
+
+
+@receiver([post_save, post_delete], sender=BotPreferences)
+def invalidate_bot_preferences(sender, **kwargs):
+    BOT_PREFERENCES_CACHE.invalidate_on_commit()
@@ -1,16 +1,20 @@
-import asyncio
-
 from daterangefilter.filters import DateRangeFilter
 from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.core.handlers.wsgi import WSGIRequest
-from django.db.models import QuerySet
+from django.db import transaction
+from django.db.models import QuerySet, Value, FloatField
 from django.utils.html import format_html_join, format_html
-from preferences import preferences
 
-from bot.manager import BotManager
-from common.utils import use_thread, to_rub
-from .models import Account, Item, ItemsFile
+from bot.domain.enums import CommandAction
+from bot.models import BotCommand
+from common.cache import ITEM_HASH_NAMES_CACHE
+from common.paginators import EstimatedCountPaginator
+from common.utils import to_rub
+from settings.models import BotPreferences
+from .domain.enums import ImportStatus
+from .models import Account, Item, ItemsFile, ImportJob
 
 HREF_URI_PATTERN = "<a href='{}' target=_blank>{}</a>"
 MARKET_HASH_NAME_PATTERN = "{links} {name}"
@@ -18,14 +22,21 @@ ITEM_PRICE_PATTERN = "<text>₽{ru_price}(${usd_price})</text>"
 ITEM_MARKET_INFO_PATTERN = "<text>{min_price}({profit}%)/{position}/{count}</text>"
 ITEM_SLASH_PATTERN = "<text>{left}/{right}</text>"
 MARKET_LINK = f'{settings.MARKET_SETTINGS.host}/?&sd=asc&s=price&r=&q=&search='
+ITEM_CHANGELIST_DEFERRED_FIELDS = [
+    'market_id',
+    'trade_id',
+    'drive_discount_percent',
+    'content_hash',
+    'account__password',
+    'account__shared_secret',
+    'account__identity_secret',
+    'account__market_api_key',
+    'account__steam_api',
+]
 
 
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
-    def __init__(self, model, admin_site):
-        super().__init__(model, admin_site)
-        self._bot_manager = BotManager()
-
     list_display = (
         'login',
         'steam_id',
@@ -46,16 +57,24 @@ class AccountAdmin(admin.ModelAdmin):
 
     @admin.action(description='Turn on selected accounts')
     def turn_on_bot_account(self, request: WSGIRequest, accounts: QuerySet[Account]):
-        bots = list(accounts.filter(is_on=False))
-        use_thread(lambda: asyncio.run(self._bot_manager.run_bots(bots)))
-
-        accounts.update(is_on=True)
+        with transaction.atomic():
+            accounts = list(accounts.filter(is_on=False))
+            Account.objects.filter(id__in=[account.id for account in accounts]).update(is_on=True)
+            BotCommand.send(accounts, CommandAction.Start)
 
     @admin.action(description='Turn off selected accounts')
     def turn_off_bot_account(self, request: WSGIRequest, accounts: QuerySet[Account]):
-        self._bot_manager.stop_bots(list(accounts.filter(is_on=True)))
+        with transaction.atomic():
+            accounts = list(accounts.filter(is_on=True))
+            Account.objects.filter(id__in=[account.id for account in accounts]).update(is_on=False)
+            BotCommand.send(accounts, CommandAction.Stop)
+
 
-        accounts.update(is_on=False)
+class ItemChangeList(ChangeList):
+    def get_queryset(self, request: WSGIRequest) -> QuerySet[Item]:
+        return super().get_queryset(request).defer(*ITEM_CHANGELIST_DEFERRED_FIELDS).annotate(
+            currency_rate=Value(BotPreferences.get_cached().currency_rate, output_field=FloatField())
+        )
 
 
 @admin.register(Item)
@@ -93,6 +112,24 @@ class AccountItemAdmin(admin.ModelAdmin):
         'asset_id',
         'trade_id',
     )
+    list_select_related = ('account', )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_changelist(self, request: WSGIRequest, **kwargs):
+        return ItemChangeList
+
+    def save_model(self, request: WSGIRequest, obj: Item, form, change: bool):
+        super().save_model(request, obj, form, change)
+        ITEM_HASH_NAMES_CACHE.invalidate_on_commit()
+
+    def delete_model(self, request: WSGIRequest, obj: Item):
+        super().delete_model(request, obj)
+        ITEM_HASH_NAMES_CACHE.invalidate_on_commit()
+
+    def delete_queryset(self, request: WSGIRequest, queryset: QuerySet[Item]):
+        super().delete_queryset(request, queryset)
+        ITEM_HASH_NAMES_CACHE.invalidate_on_commit()
 
     def market_name(self, obj):
         links = [(MARKET_LINK + obj.market_hash_name, 'EU'), (MARKET_LINK + obj.market_ru_name, 'RU')]
@@ -103,14 +140,14 @@ class AccountItemAdmin(admin.ModelAdmin):
     def google_price(self, obj):
         return format_html(
             ITEM_PRICE_PATTERN,
-            ru_price=to_rub(obj.google_price_usd, self._get_currency_rate(), 2),
+            ru_price=to_rub(obj.google_price_usd, self._get_currency_rate(obj), 2),
             usd_price=obj.google_price_usd
         )
 
     def steam_price(self, obj):
         return format_html(
             ITEM_PRICE_PATTERN,
-            ru_price=to_rub(float(obj.google_price_usd), self._get_currency_rate(), 2),
+            ru_price=to_rub(float(obj.google_price_usd), self._get_currency_rate(obj), 2),
             usd_price=obj.steam_price_usd
         )
 
@@ -134,8 +171,8 @@ class AccountItemAdmin(admin.ModelAdmin):
         return format_html(ITEM_SLASH_PATTERN, left=f'{obj.min_profit}%', right=f'{obj.max_profit}%')
 
     @staticmethod
-    def _get_currency_rate() -> float:
-        return preferences.BotPreferences.currency_rate
+    def _get_currency_rate(obj: Item) -> float:
+        return getattr(obj, 'currency_rate', None) or BotPreferences.get_cached().currency_rate
 
     @admin.display(description='Steam time')
     def steam_time_formatted(self, obj):
@@ -164,4 +201,36 @@ class AccountItemAdmin(admin.ModelAdmin):
     profits.admin_order_field = 'min_profit'
 
 
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'items_file',
+        'status',
+        'found',
+        'saved',
+        'failed',
+        'added',
+        'changed',
+        'unchanged',
+        'removed',
+        'created',
+        'started',
+        'finished',
+    )
+    list_filter = ['status']
+    readonly_fields = [field.name for field in ImportJob._meta.fields]
+    actions = ['rerun_import_job', ]
+
+    def has_add_permission(self, request: WSGIRequest) -> bool:
+        return False
+
+    @admin.action(description='Re-run selected jobs')
+    def rerun_import_job(self, request: WSGIRequest, jobs: QuerySet[ImportJob]):
+        jobs.exclude(status=ImportStatus.Running.value).update(
+            status=ImportStatus.Pending.value, started=None, finished=None, found=0, saved=0, failed=0, errors='',
+            added=0, changed=0, unchanged=0, removed=0,
+        )
+
+
 admin.site.register(ItemsFile)
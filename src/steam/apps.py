@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SteamConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'steam'
+
+    def ready(self):
+        from . import signals
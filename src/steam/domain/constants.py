@@ -0,0 +1,9 @@
+import os
+from typing import Final
+
+ITEMS_IMPORT_CHUNK_SIZE: Final[int] = 2000
+ITEMS_IMPORT_POLLING_INTERVAL: Final[float] = 5
+ITEMS_IMPORT_STALE_TIMEOUT: Final[float] = 10 * 60
+ITEMS_IMPORT_MAX_ERRORS: Final[int] = 100
+ITEMS_PARSE_CHUNK_SIZE: Final[int] = 1000
+ITEMS_PARSE_WORKERS: Final[int] = os.cpu_count() or 1
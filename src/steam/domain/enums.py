@@ -33,3 +33,10 @@ class CorrectName(BaseEnum):
     Yes = 256
     No = 512
     Wait = 1024
+
+
+class ImportStatus(BaseEnum):
+    Pending = 1
+    Running = 2
+    Done = 3
+    Failed = 4
@@ -1,7 +1,9 @@
+import hashlib
 from datetime import datetime
 from decimal import Decimal
-from typing import List
+from typing import NamedTuple, List
 
+import orjson
 from pydantic import BaseModel, Field
 
 from .enums import HoldStatus, Status, Place, CorrectName
@@ -38,11 +40,18 @@ class ItemModel(BaseModel):
         dict_['market_ru_name'] = self.ru_name
         return dict_
 
+    def content_hash(self) -> str:
+        content = orjson.dumps({**self.to_dict(), 'bot': self.bot}, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.md5(content).hexdigest()
 
-class ItemsJsonModel(BaseModel):
-    items: List[dict]
-    # currency rate
-    u: float
+
+class ItemParseError(NamedTuple):
+    asset_id: str
+    bot: str
+    errors: List[dict]
+
+    def __str__(self) -> str:
+        return f'{self.asset_id}: {self.errors}'
 
 
 class SteamGuard(BaseModel):
@@ -0,0 +1,204 @@
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from traceback import format_exc as traceback
+from typing import IO, Dict, Iterable, List, Callable, Optional
+
+import ijson
+from django.db import transaction, DatabaseError
+from django.db.models import Q
+from django.utils import timezone
+
+from common.cache import ITEM_HASH_NAMES_CACHE, BOT_PREFERENCES_CACHE
+from common.db import analyze
+from common.utils import get_log_extra as extra
+from settings.models import BotPreferences
+from .domain.constants import ITEMS_IMPORT_CHUNK_SIZE, ITEMS_IMPORT_POLLING_INTERVAL, ITEMS_IMPORT_STALE_TIMEOUT, \
+    ITEMS_IMPORT_MAX_ERRORS, ITEMS_PARSE_WORKERS
+from .domain.enums import ImportStatus
+from .domain.models import ItemModel
+from .models import Account, Item, ImportJob
+from .parsers import ItemParser
+
+logger = logging.getLogger(__name__)
+
+ITEM_IMPORT_FIELDS = [
+    'account_id',
+    'market_hash_name',
+    'market_ru_name',
+    'google_price_usd',
+    'google_drive_time',
+    'steam_price_usd',
+    'steam_time',
+    'hold',
+    'hold_status',
+    'status',
+    'place',
+    'trade_id',
+    'drive_discount',
+    'drive_discount_percent',
+    'correct_name',
+    'content_hash',
+]
+ITEM_IMPORT_FIELDS_WITHOUT_STATUS = [field for field in ITEM_IMPORT_FIELDS if field != 'status']
+
+
+@dataclass
+class ImportStats:
+    added: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def saved(self) -> int:
+        return self.added + self.changed
+
+
+class ItemsImporter:
+    def __init__(self, chunk_size: int = ITEMS_IMPORT_CHUNK_SIZE, workers: int = ITEMS_PARSE_WORKERS):
+        self._chunk_size = chunk_size
+        self._workers = workers
+        self._accounts: Dict[str, int] = dict(Account.objects.values_list('login', 'id'))
+
+    def import_file(
+            self,
+            file: IO[bytes],
+            on_progress: Callable[[ItemParser, ImportStats], None] = None,
+    ) -> ImportStats:
+        parser = ItemParser(ijson.items(file, 'items.item'))
+        stats = ImportStats()
+        for chunk in parser.iter_batches_for_accounts(self._accounts, self._workers, self._chunk_size):
+            self._save_chunk(chunk, stats)
+            if on_progress:
+                on_progress(parser, stats)
+
+        stats.removed = self._count_removed(parser)
+
+        if stats.saved:
+            ITEM_HASH_NAMES_CACHE.invalidate()
+        if stats.added or stats.removed:
+            analyze(Item)
+
+        file.seek(0)
+        if (currency_rate := next(ijson.items(file, 'u'), None)) is not None:
+            BotPreferences.objects.all().update(currency_rate=float(currency_rate))
+            BOT_PREFERENCES_CACHE.invalidate()
+
+        logger.info(f'Imported items. {stats}')
+        return stats
+
+    def _count_removed(self, parser: ItemParser) -> int:
+        accounts_items = Item.objects.filter(account_id__in=[self._accounts[login] for login in parser.seen_bots])
+        asset_ids = accounts_items.values_list('asset_id', flat=True).iterator(self._chunk_size)
+        return sum(asset_id not in parser.seen_asset_ids for asset_id in asset_ids)
+
+    def _save_chunk(self, items: Iterable[ItemModel], stats: ImportStats):
+        items = {item.asset_id: item for item in items}
+        hashes = dict(Item.objects.filter(asset_id__in=list(items)).values_list('asset_id', 'content_hash'))
+        with_status: Dict[str, Item] = {}
+        without_status: Dict[str, Item] = {}
+        added = changed = unchanged = 0
+        for asset_id, item in items.items():
+            content_hash = item.content_hash()
+            if hashes.get(asset_id) == content_hash:
+                unchanged += 1
+                continue
+
+            if asset_id in hashes:
+                changed += 1
+            else:
+                added += 1
+            dict_ = item.to_dict()
+            dict_['account_id'] = self._accounts[item.bot]
+            (with_status if 'status' in dict_ else without_status)[asset_id] = Item(
+                asset_id=asset_id, content_hash=content_hash, **dict_
+            )
+
+        try:
+            with transaction.atomic():
+                self._upsert(list(with_status.values()), ITEM_IMPORT_FIELDS)
+                self._upsert(list(without_status.values()), ITEM_IMPORT_FIELDS_WITHOUT_STATUS)
+        except DatabaseError as ex:
+            logger.error(f'Db exception for chunk of {len(items)} items', extra=extra(traceback=traceback()))
+            stats.failed += len(items)
+            if len(stats.errors) < ITEMS_IMPORT_MAX_ERRORS:
+                stats.errors.append(f'Failed to save chunk of {len(items)} items: {ex!r}')
+            return
+
+        stats.added += added
+        stats.changed += changed
+        stats.unchanged += unchanged
+
+    @staticmethod
+    def _upsert(items: List[Item], fields: List[str]):
+        if items:
+            Item.objects.bulk_create(items, update_conflicts=True, unique_fields=['asset_id'], update_fields=fields)
+
+
+class ImportJobsWorker:
+    def __init__(
+            self,
+            polling_interval: float = ITEMS_IMPORT_POLLING_INTERVAL,
+            stale_timeout: float = ITEMS_IMPORT_STALE_TIMEOUT,
+    ):
+        self._polling_interval = polling_interval
+        self._stale_timeout = stale_timeout
+
+    def run_forever(self):
+        while True:
+            self._reset_stale_jobs()
+            if job := self._claim_next_job():
+                self.process(job)
+            else:
+                time.sleep(self._polling_interval)
+
+    def process(self, job: ImportJob):
+        logger.info(f'Start import job {job.id}')
+        self._update(job, status=ImportStatus.Running.value, started=timezone.now(), finished=None,
+                     found=0, saved=0, failed=0, added=0, changed=0, unchanged=0, removed=0, errors='')
+        try:
+            with job.items_file.file.open('rb') as f:
+                stats = ItemsImporter().import_file(f, lambda *progress: self._update_progress(job, *progress))
+            self._update(job, status=ImportStatus.Done.value, saved=stats.saved, removed=stats.removed,
+                         finished=timezone.now())
+        except Exception as ex:
+            logger.error(f'Import job {job.id} failed', extra=extra(traceback=traceback()))
+            self._update(job, status=ImportStatus.Failed.value, finished=timezone.now(), errors=f'{job.errors}\n{ex!r}')
+
+        logger.info(f'Finish import job {job.id}')
+
+    def _update_progress(self, job: ImportJob, parser: ItemParser, stats: ImportStats):
+        errors = '\n'.join([*map(str, parser.errors), *stats.errors])
+        self._update(job, found=parser.found, saved=stats.saved, failed=parser.failed + stats.failed,
+                     added=stats.added, changed=stats.changed, unchanged=stats.unchanged, errors=errors)
+
+    @staticmethod
+    def _update(job: ImportJob, **fields):
+        fields['heartbeat'] = timezone.now()
+        [setattr(job, field, value) for field, value in fields.items()]
+        ImportJob.objects.filter(id=job.id).update(**fields)
+
+    def _reset_stale_jobs(self):
+        deadline = timezone.now() - timedelta(seconds=self._stale_timeout)
+        stale = ImportJob.objects.filter(
+            Q(heartbeat__lt=deadline) | Q(heartbeat=None), status=ImportStatus.Running.value,
+        )
+        if count := stale.update(status=ImportStatus.Pending.value):
+            logger.warning(f'Reset {count} stale running import jobs')
+
+    @staticmethod
+    def _claim_next_job() -> Optional[ImportJob]:
+        pending = ImportJob.objects.filter(status=ImportStatus.Pending.value)
+        for job_id in pending.order_by('id').values_list('id', flat=True):
+            now = timezone.now()
+            claimed = ImportJob.objects.filter(id=job_id, status=ImportStatus.Pending.value).update(
+                status=ImportStatus.Running.value, started=now, heartbeat=now,
+            )
+            if claimed:
+                return ImportJob.objects.select_related('items_file').get(id=job_id)
+
+        return None
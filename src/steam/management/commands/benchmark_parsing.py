@@ -0,0 +1,63 @@
+import random
+import time
+from typing import List
+
+from django.core.management.base import BaseCommand
+
+from steam.domain.constants import ITEMS_PARSE_CHUNK_SIZE, ITEMS_PARSE_WORKERS
+from steam.domain.enums import HoldStatus, Status, Place, CorrectName
+from steam.parsers import ItemParser
+
+
+class Command(BaseCommand):
+    help = 'Measures items file parsing time for the serial and the process pool validation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=100000)
+        parser.add_argument('--accounts', type=int, default=10)
+        parser.add_argument('--workers', type=int, default=ITEMS_PARSE_WORKERS)
+        parser.add_argument('--chunk-size', type=int, default=ITEMS_PARSE_CHUNK_SIZE)
+
+    def handle(self, *args, items: int, accounts: int, workers: int, chunk_size: int, **options):
+        logins = [f'bot{number}' for number in range(accounts)]
+        raw_items = self._make_items(items, logins)
+        self.stdout.write(f'Items: {items}, accounts: {accounts}, workers: {workers}, chunk size: {chunk_size}')
+
+        then = time.perf_counter()
+        serial = ItemParser(raw_items)
+        serial.parse_for_accounts(logins)
+        serial_time = time.perf_counter() - then
+
+        then = time.perf_counter()
+        batched = ItemParser(raw_items)
+        list(batched.iter_batches_for_accounts(logins, workers, chunk_size))
+        batched_time = time.perf_counter() - then
+
+        self.stdout.write(f'Serial: {serial_time:.2f} s, parsed {serial.parsed}, failed {serial.failed}')
+        self.stdout.write(f'Batched: {batched_time:.2f} s, parsed {batched.parsed}, failed {batched.failed} '
+                          f'({serial_time / batched_time:.1f}x)')
+
+    @staticmethod
+    def _make_items(count: int, logins: List[str]) -> List[dict]:
+        return [
+            {
+                'owner_bot': random.choice(logins),
+                'bot': random.choice(logins + ['unknown']),
+                'market_hash_name': f'Item | Skin {number % 3000} (Field-Tested)',
+                'ru_name': f'Предмет | Скин {number % 3000}',
+                'google_price_usd': round(random.random() * 100, 2),
+                'google_drive_time': '2022-10-01T10:00:00',
+                'steam_price_usd': '1.25',
+                'steam_time': '2022-10-01T10:00:00',
+                'hold': '2022-10-05T10:00:00',
+                'hold_status': random.choice(HoldStatus.to_list())[0],
+                'status': random.choice(Status.to_list())[0],
+                'place': random.choice(Place.to_list())[0],
+                'asset_id': str(10 ** 10 + number) if number % 1000 else '',
+                'trade_id': '',
+                'drive_discount': '1',
+                'drive_discount_percent': '2',
+                'correct_name': random.choice(CorrectName.to_list())[0],
+            }
+            for number in range(count)
+        ]
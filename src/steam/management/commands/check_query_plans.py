@@ -0,0 +1,70 @@
+from datetime import timedelta
+from typing import Dict, List, Final
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from bot.workflow import ITEM_MARKET_DATA_READ_FIELDS
+from steam.domain.enums import Status, Place, HoldStatus
+from steam.models import Item
+
+ADMIN_PAGE_SIZE: Final[int] = 100
+FULL_SCAN_MARKERS: Dict[str, str] = {
+    'sqlite': f'SCAN {Item._meta.db_table}',
+    'postgresql': f'Seq Scan on {Item._meta.db_table}',
+}
+
+
+class Command(BaseCommand):
+    help = 'Fails if any hot Item query is planned as a full table scan. ' \
+           'Plans depend on table statistics, so run it against a populated and analyzed database'
+
+    def handle(self, *args, **options):
+        if connection.vendor not in FULL_SCAN_MARKERS:
+            raise CommandError(f'Query plans check is not supported for {connection.vendor}')
+
+        marker = FULL_SCAN_MARKERS[connection.vendor]
+        failed = []
+        for name, queryset in self._get_queries().items():
+            plan = self._explain(queryset)
+            scans = [line.strip() for line in plan if marker in line and 'COVERING INDEX' not in line]
+            self.stdout.write(f'{"FAIL" if scans else "OK"}: {name}')
+            if scans:
+                failed.append(name)
+                [self.stdout.write(f'    {line}') for line in plan]
+
+        if failed:
+            raise CommandError(f'Full table scan in {len(failed)} queries: {", ".join(failed)}')
+
+    @staticmethod
+    def _explain(queryset: QuerySet) -> List[str]:
+        return queryset.explain().splitlines()
+
+    @staticmethod
+    def _get_queries() -> Dict[str, QuerySet]:
+        now = timezone.now()
+        week = (now - timedelta(days=7), now)
+        changelist = Item.objects.order_by('-pk')
+        return {
+            'bot items status update': Item.objects.filter(
+                account_id=1, status=Status.New.value, asset_id__in=['1', '2'],
+            ),
+            'bot items market data': Item.objects.filter(
+                account_id=1, market_hash_name__in=['a', 'b'], status__in=Status.get_market_statuses(),
+            ).only(*ITEM_MARKET_DATA_READ_FIELDS),
+            'prices collector hash names': Item.objects.filter(
+                account__login__in=['a', 'b'],
+            ).values_list('account__login', 'market_hash_name').distinct(),
+            'items by hash names': Item.objects.filter(
+                market_hash_name__in=['a', 'b'], status__in=Status.get_market_statuses(),
+            ),
+            'admin filter by account': changelist.filter(account_id=1)[:ADMIN_PAGE_SIZE],
+            'admin filter by status': changelist.filter(status=Status.Wait.value)[:ADMIN_PAGE_SIZE],
+            'admin filter by place': changelist.filter(place=Place.Unknown.value)[:ADMIN_PAGE_SIZE],
+            'admin filter by hold status': changelist.filter(hold_status=HoldStatus.Undefined.value)[:ADMIN_PAGE_SIZE],
+            'admin filter by hold': changelist.filter(hold__range=week)[:ADMIN_PAGE_SIZE],
+            'admin filter by google drive time': changelist.filter(google_drive_time__range=week)[:ADMIN_PAGE_SIZE],
+            'admin filter by market time': changelist.filter(market_time__range=week)[:ADMIN_PAGE_SIZE],
+        }
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from steam.importers import ImportJobsWorker
+
+
+class Command(BaseCommand):
+    help = 'Processes uploaded items files in the background'
+
+    def handle(self, *args, **options):
+        try:
+            ImportJobsWorker().run_forever()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,22 @@
+# Generated by Django 4.1 on 2026-10-18 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0007_item_content_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='is_on',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddIndex(
+            model_name='importjob',
+            index=models.Index(fields=['status', 'id'], name='steam_impor_status_9d0fa3_idx'),
+        ),
+    ]
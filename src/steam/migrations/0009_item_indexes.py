@@ -0,0 +1,49 @@
+# Generated by Django 4.1 on 2026-10-18 10:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0008_polling_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['account', 'status'], name='steam_item_account_c7c578_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['account', 'market_hash_name', 'status'], name='steam_item_account_826724_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['market_hash_name', 'status'], name='steam_item_market__8ff868_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['status'], name='steam_item_status_5d0bdc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['hold'], name='steam_item_hold_c209ad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['place'], name='steam_item_place_5431a3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['hold_status'], name='steam_item_hold_st_923385_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['google_drive_time'], name='steam_item_google__caae2c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['market_time'], name='steam_item_market__3684a2_idx'),
+        ),
+    ]
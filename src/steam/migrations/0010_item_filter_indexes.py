@@ -0,0 +1,37 @@
+# Generated by Django 4.1 on 2026-10-18 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('steam', '0009_item_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='item',
+            name='steam_item_status_5d0bdc_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='item',
+            name='steam_item_place_5431a3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='item',
+            name='steam_item_hold_st_923385_idx',
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['status', 'asset_id'], name='steam_item_status_086f33_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['place', 'asset_id'], name='steam_item_place_40f8e5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['hold_status', 'asset_id'], name='steam_item_hold_st_8124c2_idx'),
+        ),
+    ]
@@ -1,21 +1,12 @@
-import json
-import logging
 from decimal import Decimal
-from traceback import format_exc as traceback
 
-from django.db import models, DatabaseError
-from django.db.models import QuerySet
+from django.db import models
 from djmoney.models.fields import MoneyField
-from preferences import preferences
 
-from common.utils import get_log_extra as extra, to_rub
+from common.utils import to_rub
 from common.validators import PERCENTAGE_VALIDATOR, JSON_FILE_VALIDATOR
 from settings.models import BotPreferences
-from .domain.enums import Status, HoldStatus, Place, CorrectName
-from .domain.models import ItemsJsonModel, ItemModel
-from .parsers import ItemParser
-
-logger = logging.getLogger(__name__)
+from .domain.enums import Status, HoldStatus, Place, CorrectName, ImportStatus
 
 
 class Account(models.Model):
@@ -28,7 +19,7 @@ class Account(models.Model):
     market_api_key = models.CharField(max_length=99, unique=True)
     google_drive_id = models.CharField(max_length=99, unique=True)
     proxy = models.CharField(max_length=99)
-    is_on = models.BooleanField(default=False)
+    is_on = models.BooleanField(default=False, db_index=True)
 
     def __str__(self):
         return self.login
@@ -63,13 +54,28 @@ class Item(models.Model):
                                      validators=PERCENTAGE_VALIDATOR)
     expected_min_price = MoneyField(max_digits=14, decimal_places=2, null=True, blank=True, default_currency='RUB')
     expected_max_price = MoneyField(max_digits=14, decimal_places=2, null=True, blank=True, default_currency='RUB')
+    content_hash = models.CharField(max_length=32, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['account', 'status']),
+            models.Index(fields=['account', 'market_hash_name', 'status']),
+            models.Index(fields=['market_hash_name', 'status']),
+            models.Index(fields=['status', 'asset_id']),
+            models.Index(fields=['place', 'asset_id']),
+            models.Index(fields=['hold_status', 'asset_id']),
+            models.Index(fields=['hold']),
+            models.Index(fields=['google_drive_time']),
+            models.Index(fields=['market_time']),
+        ]
 
     def __str__(self):
         return self.market_hash_name
 
-    def calculate_expected_prices(self):
-        self.expected_min_price = to_rub(self._get_expected_price(self.min_profit), self._get_currency_rate(), 2)
-        self.expected_max_price = to_rub(self._get_expected_price(self.max_profit), self._get_currency_rate(), 2)
+    def calculate_expected_prices(self, currency_rate: float = None):
+        currency_rate = self._get_currency_rate() if currency_rate is None else currency_rate
+        self.expected_min_price = to_rub(self._get_expected_price(self.min_profit), currency_rate, 2)
+        self.expected_max_price = to_rub(self._get_expected_price(self.max_profit), currency_rate, 2)
 
     def _get_expected_price(self, profit: Decimal) -> float:
         profit_amount = self.google_price_usd / 100 * float(profit)
@@ -77,31 +83,42 @@ class Item(models.Model):
 
     @staticmethod
     def _get_currency_rate() -> float:
-        return preferences.BotPreferences.currency_rate
+        return BotPreferences.get_cached().currency_rate
 
 
 class ItemsFile(models.Model):
     file = models.FileField(validators=JSON_FILE_VALIDATOR)
 
     def save(self, *args, **kwargs):
-        with self.file.open('r') as f:
-            raw = json.load(f)
-            parser = ItemParser(json_model := ItemsJsonModel(**raw))
-            accounts = Account.objects.all()
-            items = parser.parse_for_accounts(list(accounts.values_list('login', flat=True)))
-
-            [self._save_item(item, accounts) for item in items]
-
-            BotPreferences.objects.all().update(currency_rate=json_model.u)
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding:
+            ImportJob.objects.create(items_file=self)
 
-    @staticmethod
-    def _save_item(item: ItemModel, accounts: QuerySet[Account]):
-        dict_ = item.to_dict()
-        dict_['account_id'] = accounts.get(login=item.bot).id
-        try:
-            Item.objects.update_or_create(asset_id=item.asset_id, defaults=dict_)
-        except DatabaseError:
-            logger.error(f'Db exception for {item.asset_id} item', extra=extra(item.bot, traceback()))
+    def __str__(self):
+        return f'Steam items file {self.file.name}'
+
+
+class ImportJob(models.Model):
+    items_file = models.ForeignKey(ItemsFile, on_delete=models.CASCADE)
+    status = models.IntegerField(choices=ImportStatus.to_list(), default=ImportStatus.Pending.value)
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(blank=True, null=True)
+    finished = models.DateTimeField(blank=True, null=True)
+    heartbeat = models.DateTimeField(blank=True, null=True, editable=False)
+    found = models.PositiveIntegerField(default=0)
+    saved = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    added = models.PositiveIntegerField(default=0)
+    changed = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    removed = models.PositiveIntegerField(default=0)
+    errors = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
 
     def __str__(self):
-        return 'Parsed steam items file'
+        return f'Import of {self.items_file}'
@@ -1,39 +1,97 @@
 import logging
-from traceback import format_exc as traceback
-from typing import Optional, List
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import Optional, List, Iterable, Iterator, Collection, Tuple, Set, Deque
 
 from pydantic import ValidationError
 
-from common.utils import get_log_extra as extra
-from .domain.models import ItemModel, ItemsJsonModel
+from common.utils import get_log_extra as extra, to_chunks
+from .domain.constants import ITEMS_IMPORT_MAX_ERRORS, ITEMS_PARSE_CHUNK_SIZE, ITEMS_PARSE_WORKERS
+from .domain.models import ItemModel, ItemParseError
 
 logger = logging.getLogger(__name__)
 
+ParsedChunk = Tuple[List[ItemModel], List[ItemParseError]]
+
+
+def parse_chunk(items: Iterable[dict]) -> ParsedChunk:
+    models, errors = [], []
+    for item in items:
+        try:
+            models.append(ItemModel(**item))
+        except ValidationError as ex:
+            errors.append(ItemParseError(str(item.get('asset_id')), str(item.get('bot')), ex.errors()))
+
+    return models, errors
+
 
 class ItemParser:
-    def __init__(self, json_model: ItemsJsonModel):
-        self._items = json_model.items
+    def __init__(self, items: Iterable[dict], max_errors: int = ITEMS_IMPORT_MAX_ERRORS):
+        self._items = items
+        self._max_errors = max_errors
+        self.found = 0
+        self.parsed = 0
+        self.failed = 0
+        self.errors: List[ItemParseError] = []
+        self.seen_bots: Set[str] = set()
+        self.seen_asset_ids: Set[str] = set()
+
+    def parse_for_accounts(self, accounts_names: Collection[str]) -> List[ItemModel]:
+        return list(self.iter_for_accounts(accounts_names))
+
+    def iter_for_accounts(self, accounts_names: Collection[str]) -> Iterator[ItemModel]:
+        for item in self._filter(set(accounts_names)):
+            if model := self.parse_model(item):
+                self.parsed += 1
+                yield model
 
-    def parse_for_accounts(self, accounts_names: List[str]) -> List[ItemModel]:
-        parsed_counter = 0
-        models = []
+        logger.info(f'Found {self.found} items. Parsed: {self.parsed}')
+
+    def iter_batches_for_accounts(
+            self,
+            accounts_names: Collection[str],
+            workers: int = ITEMS_PARSE_WORKERS,
+            chunk_size: int = ITEMS_PARSE_CHUNK_SIZE,
+    ) -> Iterator[List[ItemModel]]:
+        chunks = to_chunks(self._filter(set(accounts_names)), chunk_size)
+        if workers < 2:
+            yield from (self._collect(parse_chunk(chunk)) for chunk in chunks)
+        else:
+            with ProcessPoolExecutor(workers) as executor:
+                pending: Deque[Future] = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(parse_chunk, chunk))
+                    if len(pending) > workers * 2:
+                        yield self._collect(pending.popleft().result())
+                while pending:
+                    yield self._collect(pending.popleft().result())
+
+        logger.info(f'Found {self.found} items. Parsed: {self.parsed}')
+
+    def parse_model(self, item: dict) -> Optional[ItemModel]:
+        models, errors = parse_chunk((item,))
+        self._record_errors(errors)
+
+        return models[0] if models else None
+
+    def _filter(self, accounts_names: Set[str]) -> Iterator[dict]:
         for item in self._items:
+            self.found += 1
             if item['bot'] in accounts_names:
-                if model := self.parse_model(item):
-                    models.append(model)
-                    parsed_counter += 1
+                self.seen_bots.add(item['bot'])
+                self.seen_asset_ids.add(str(item.get('asset_id')))
+                yield item
 
-        logger.info(f'Found {len(self._items)} items. Parsed: {parsed_counter}')
+    def _collect(self, parsed: ParsedChunk) -> List[ItemModel]:
+        models, errors = parsed
+        self.parsed += len(models)
+        self._record_errors(errors)
 
         return models
 
-    @staticmethod
-    def parse_model(item: dict) -> Optional[ItemModel]:
-        model = None
-        try:
-            model = ItemModel(**item)
-        except ValidationError:
-            logger.warning(f'Parsing validation error for {item["asset_id"]} item',
-                           extra=extra(item['bot'], traceback()))
-
-        return model
+    def _record_errors(self, errors: List[ItemParseError]):
+        for error in errors:
+            logger.warning(f'Parsing validation error for {error.asset_id} item: {error.errors}',
+                           extra=extra(error.bot))
+        self.failed += len(errors)
+        self.errors.extend(errors[:max(self._max_errors - len(self.errors), 0)])
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from common.cache import ITEM_HASH_NAMES_CACHE
+from .models import Account
+
+
+@receiver([post_save, post_delete], sender=Account)
+def invalidate_item_hash_names(sender, **kwargs):
+    ITEM_HASH_NAMES_CACHE.invalidate_on_commit()
@@ -0,0 +1,101 @@
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from typing import Final, List, Dict
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from common.db import analyze
+from common.utils import BaseEnum
+from .domain.enums import Status, Place, HoldStatus, CorrectName
+from .models import Account, Item
+
+QUERY_PLANS_ITEMS: Final[int] = 200000
+QUERY_PLANS_ACCOUNTS: Final[int] = 50
+QUERY_PLANS_HASH_NAMES: Final[int] = 5000
+QUERY_PLANS_BATCH_SIZE: Final[int] = 5000
+
+STATUS_WEIGHTS = {
+    Status.Wait: 60,
+    Status.Check: 15,
+    Status.Offered: 10,
+    Status.New: 10,
+    Status.NotAtSteamInv: 5,
+}
+PLACE_WEIGHTS = {
+    Place.Unknown: 90,
+    Place.Google885: 4,
+    Place.Google886: 3,
+    Place.Google888: 2,
+    Place.Casino: 1,
+}
+HOLD_STATUS_WEIGHTS = {
+    HoldStatus.Undefined: 90,
+    HoldStatus.Hold: 5,
+    HoldStatus.NotAtHold: 5,
+}
+
+
+class QueryPlansTest(TransactionTestCase):
+    def setUp(self):
+        self._random = random.Random(0)
+        self._now = timezone.now()
+        accounts = Account.objects.bulk_create(self._get_account(number) for number in range(QUERY_PLANS_ACCOUNTS))
+        Item.objects.bulk_create(
+            (self._get_item(number, accounts) for number in range(QUERY_PLANS_ITEMS)),
+            batch_size=QUERY_PLANS_BATCH_SIZE,
+        )
+        analyze(Account)
+        analyze(Item)
+        # Autovacuum fills the visibility map in production, without it index-only scans cost as much as heap reads
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'VACUUM {Item._meta.db_table}')
+
+    def test_hot_queries_use_indexes(self):
+        call_command('check_query_plans', stdout=StringIO())
+
+    @staticmethod
+    def _get_account(number: int) -> Account:
+        return Account(
+            login=f'bot{number}',
+            password='password',
+            steam_id=number,
+            steam_api=f'steam-api-{number}',
+            shared_secret='secret',
+            identity_secret='secret',
+            market_api_key=f'market-key-{number}',
+            google_drive_id=f'drive-{number}',
+            proxy='',
+        )
+
+    def _get_item(self, number: int, accounts: List[Account]) -> Item:
+        hash_name = f'Item {self._random.randrange(QUERY_PLANS_HASH_NAMES)}'
+        return Item(
+            asset_id=str(10 ** 10 + number),
+            account=self._random.choice(accounts),
+            market_hash_name=hash_name,
+            market_ru_name=hash_name,
+            market_time=self._get_time(60) if self._random.random() < 0.8 else None,
+            google_price_usd=self._random.uniform(1, 100),
+            google_drive_time=self._get_time(60),
+            steam_price_usd=Decimal('1.00'),
+            steam_time=self._get_time(60),
+            status=self._choose(STATUS_WEIGHTS),
+            place=self._choose(PLACE_WEIGHTS),
+            hold=self._get_time(30) + timedelta(days=7),
+            hold_status=self._choose(HOLD_STATUS_WEIGHTS),
+            drive_discount='0',
+            drive_discount_percent='0',
+            correct_name=CorrectName.Yes.value,
+        )
+
+    def _choose(self, weights: Dict[BaseEnum, int]) -> int:
+        return self._random.choices(list(weights), list(weights.values()))[0].value
+
+    def _get_time(self, days: int) -> datetime:
+        return self._now - timedelta(seconds=self._random.randrange(days * 24 * 60 * 60))